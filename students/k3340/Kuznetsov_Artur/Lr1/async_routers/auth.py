@@ -0,0 +1,103 @@
+from fastapi import APIRouter, HTTPException, Depends, Security
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from connection import get_async_session
+from hashing import hash_password_async, verify_password_async
+from models import Users
+from routers.auth import (
+    auth_scheme, cache_user, create_access_token, get_cached_user, invalidate_user, verify_token
+)
+from schemas import UserCreate, UserRead, UserLogin, UserPassword, UserWithToken
+
+router = APIRouter(prefix = "/auth", tags = ["Authentication"])
+
+
+async def create_user_with_hash(user_create: UserCreate, session: AsyncSession) -> Users:
+    username_statement = select(Users).where(Users.username == user_create.username)
+    existing_user = (await session.exec(username_statement)).first()
+    if existing_user:
+        raise HTTPException(status_code = 400, detail = "Username already registered")
+
+    email_statement = select(Users).where(Users.email == user_create.email)
+    existing_email = (await session.exec(email_statement)).first()
+    if existing_email:
+        raise HTTPException(status_code = 400, detail = "Email already registered")
+    await session.close()
+
+    hashed_password = await hash_password_async(user_create.password)
+
+    new_user = Users(
+        username = user_create.username,
+        password = hashed_password,
+        first_name = user_create.first_name,
+        last_name = user_create.last_name,
+        email = user_create.email
+    )
+    session.add(new_user)
+    await session.commit()
+    await session.refresh(new_user)
+    return new_user
+
+
+async def create_user_and_token(user_create: UserCreate, session: AsyncSession) -> UserWithToken:
+    user = await create_user_with_hash(user_create, session)
+    token = create_access_token(data = {"sub": user.username})
+    return UserWithToken(user = UserRead.model_validate(user), access_token = token)
+
+
+@router.post("/register", response_model = UserWithToken)
+async def register(user_create: UserCreate, session: AsyncSession = Depends(get_async_session)):
+    return await create_user_and_token(user_create, session)
+
+
+@router.post("/login", response_model = UserWithToken)
+async def login(user_login: UserLogin, session: AsyncSession = Depends(get_async_session)):
+    statement = select(Users).where(Users.username == user_login.username)
+    user = (await session.exec(statement)).first()
+    await session.close()
+    if not user or not await verify_password_async(user_login.password, user.password):
+        raise HTTPException(status_code = 401, detail = "Invalid credentials")
+    token = create_access_token(data = {"sub": user.username})
+    return {
+        "user": UserRead.model_validate(user),
+        "access_token": token,
+        "token_type": "bearer"
+    }
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Security(auth_scheme),
+    session: AsyncSession = Depends(get_async_session)
+) -> Users:
+    token = credentials.credentials
+    username = verify_token(token)
+    user = get_cached_user(username)
+    if user:
+        return await session.merge(user, load = False)
+    statement = select(Users).where(Users.username == username)
+    user = (await session.exec(statement)).first()
+    if not user: raise HTTPException(status_code = 404, detail = "User not found")
+    cache_user(user)
+    return user
+
+
+@router.get("/me", response_model = UserRead)
+async def read_current_user(current_user: Users = Depends(get_current_user)):
+    return current_user
+
+
+@router.patch("/change-password")
+async def change_password(
+    pwd_data: UserPassword,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    await session.close()
+    if not await verify_password_async(pwd_data.old_password, current_user.password):
+        raise HTTPException(status_code = 400, detail = "Incorrect current password")
+    current_user.password = await hash_password_async(pwd_data.new_password)
+    session.add(current_user)
+    await session.commit()
+    invalidate_user(current_user.username)
+    return {"message": "Password updated successfully"}
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from connection import get_async_session
+from models import Budgets, Users
+from routers import budgets
+from schemas import BudgetCreate, BudgetRead, BudgetUpdate
+from async_routers.auth import get_current_user
+from typing import List
+
+router = APIRouter(prefix = "/budgets", tags = ["Budgets"])
+
+
+@router.post("/", response_model = BudgetRead)
+async def create_budget(
+    budget: BudgetCreate,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(lambda sync_session: budgets.create_budget(budget, current_user, sync_session))
+
+
+@router.get("/", response_model = List[BudgetRead])
+async def read_budgets(
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return budgets.budgets_response((await session.exec(budgets.budgets_statement(current_user.user_id))).all())
+
+
+@router.get("/{budget_id}", response_model = BudgetRead)
+async def read_budget(
+    budget_id: int,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    budget = await session.get(Budgets, budget_id)
+    if not budget:
+        raise HTTPException(status_code = 404, detail = "Budget not found")
+    if budget.user_id != current_user.user_id:
+        raise HTTPException(status_code = 403, detail = "Not authorized to view this budget")
+    return budget
+
+
+@router.patch("/{budget_id}", response_model = BudgetRead)
+async def update_budget(
+    budget_id: int,
+    budget_update: BudgetUpdate,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(
+        lambda sync_session: budgets.update_budget(budget_id, budget_update, current_user, sync_session)
+    )
+
+
+@router.delete("/{budget_id}")
+async def delete_budget(
+    budget_id: int,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(lambda sync_session: budgets.delete_budget(budget_id, current_user, sync_session))
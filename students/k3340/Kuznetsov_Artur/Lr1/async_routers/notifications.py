@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from connection import get_async_session
+from events import notification_events
+from models import Notifications, Users
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from routers import notifications
+from routers.notifications import notifications_page, notifications_page_statement, unread_count_statement
+from schemas import MarkReadResult, NotificationMarkRead, NotificationPage, NotificationRead, UnreadCount
+from async_routers.auth import get_current_user
+from typing import Optional
+
+router = APIRouter(prefix = "/notifications", tags = ["Notifications"])
+
+
+@router.get("/", response_model = NotificationPage)
+async def read_notifications(
+    unread_only: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge = 1, le = MAX_PAGE_SIZE),
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    statement = notifications_page_statement(current_user.user_id, unread_only, cursor, limit)
+    return notifications_page((await session.exec(statement)).all(), limit)
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    current_user: Users = Depends(get_current_user)
+):
+    return StreamingResponse(
+        notification_events(request, current_user.user_id),
+        media_type = "text/event-stream",
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/unread-count", response_model = UnreadCount)
+async def read_unread_count(
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    unread = (await session.exec(unread_count_statement(current_user.user_id))).first()
+    return {"unread": unread or 0}
+
+
+@router.patch("/mark-read", response_model = MarkReadResult)
+async def mark_notifications_read(
+    mark_read: NotificationMarkRead,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(
+        lambda sync_session: notifications.mark_notifications_read(mark_read, current_user, sync_session)
+    )
+
+
+@router.get("/{notification_id}", response_model = NotificationRead)
+async def read_notification(
+    notification_id: int,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    notification = await session.get(Notifications, notification_id)
+    if not notification:
+        raise HTTPException(status_code = 404, detail = "Notification not found")
+    if notification.user_id != current_user.user_id:
+        raise HTTPException(status_code = 403, detail = "Not authorized to view this notification")
+    return notification
+
+
+@router.patch("/{notification_id}/mark-read", response_model = NotificationRead)
+async def mark_notification_read(
+    notification_id: int,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(
+        lambda sync_session: notifications.mark_notification_read(notification_id, current_user, sync_session)
+    )
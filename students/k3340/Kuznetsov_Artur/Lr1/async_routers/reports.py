@@ -0,0 +1,31 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from connection import get_async_session
+from models import Users
+from routers.reports import (
+    aggregate_range, is_month_start, merge_summaries, range_statement, summary_rows, summary_statement
+)
+from schemas import SummaryGroup, SummaryRow
+from async_routers.auth import get_current_user
+from typing import List, Optional
+
+router = APIRouter(prefix = "/reports", tags = ["Reports"])
+
+
+@router.get("/summary", response_model = List[SummaryRow])
+async def read_summary(
+    date_from: Optional[datetime] = Query(None, alias = "from"),
+    date_to: Optional[datetime] = Query(None, alias = "to"),
+    group_by: SummaryGroup = SummaryGroup.category,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    if is_month_start(date_from) and is_month_start(date_to):
+        rows = (await session.exec(summary_statement(current_user.user_id, group_by, date_from, date_to))).all()
+        if date_to is None or (date_from is not None and date_from > date_to):
+            return summary_rows(rows, group_by)
+        boundary = (await session.exec(range_statement(current_user.user_id, group_by, date_to, date_to))).all()
+        return merge_summaries(summary_rows(rows, group_by), aggregate_range(boundary, group_by), group_by)
+    rows = (await session.exec(range_statement(current_user.user_id, group_by, date_from, date_to))).all()
+    return aggregate_range(rows, group_by)
@@ -0,0 +1,151 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from connection import async_engine, get_async_session
+from models import TransactionTags, Transactions, Users
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from routers import transactions
+from routers.transactions import (
+    BULK_IMPORT_OPENAPI, TransactionExporter, TransactionImporter, export_response, export_statement, import_transactions,
+    page_tags_statement, transaction_filters, transaction_with_tags_statement, transactions_page,
+    transactions_page_response, transactions_page_statement
+)
+from schemas import (
+    BulkImportResult, ExportFormat, TransactionBatchDelete, TransactionBatchDeleteResult, TransactionBatchUpdate,
+    TransactionCreate, TransactionFilters, TransactionPage, TransactionRead, TransactionTagRead, TransactionUpdate
+)
+from async_routers.auth import get_current_user
+from typing import List, Optional
+
+router = APIRouter(prefix = "/transactions", tags = ["Transactions"])
+
+
+@router.post("/", response_model = TransactionRead)
+async def create_transaction(
+    transaction: TransactionCreate,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(
+        lambda sync_session: transactions.create_transaction(transaction, current_user, sync_session)
+    )
+
+
+@router.post("/bulk", response_model = BulkImportResult, openapi_extra = BULK_IMPORT_OPENAPI)
+async def bulk_create_transactions(
+    request: Request,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    importer = await session.run_sync(lambda sync_session: TransactionImporter(current_user.user_id, sync_session))
+    imported = await import_transactions(
+        request,
+        importer,
+        lambda fn, *args: session.run_sync(lambda _: fn(*args))
+    )
+    return {"imported": imported}
+
+
+@router.get("/export", response_class = StreamingResponse)
+async def export_transactions(
+    export_format: ExportFormat = Query(ExportFormat.csv, alias = "format"),
+    date_from: Optional[datetime] = Query(None, alias = "from"),
+    date_to: Optional[datetime] = Query(None, alias = "to"),
+    current_user: Users = Depends(get_current_user)
+):
+    statement = export_statement(current_user.user_id, date_from, date_to)
+    exporter = TransactionExporter(export_format)
+
+    async def chunks():
+        async with AsyncSession(async_engine) as session:
+            yield exporter.header()
+            result = await session.stream(statement)
+            async for rows in result.partitions():
+                yield exporter.write(rows)
+            yield exporter.finish()
+
+    return export_response(chunks(), export_format)
+
+
+@router.get("/tags", response_model = List[TransactionTagRead])
+async def read_transaction_tags(
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    statement = select(TransactionTags).join(Transactions).where(Transactions.user_id == current_user.user_id)
+    tags_relations = (await session.exec(statement)).all()
+    return tags_relations
+
+
+@router.get("/", response_model = TransactionPage)
+async def read_transactions(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge = 1, le = MAX_PAGE_SIZE),
+    filters: TransactionFilters = Depends(transaction_filters),
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    statement = transactions_page_statement(current_user.user_id, filters, cursor, limit)
+    page = transactions_page((await session.exec(statement)).all(), limit)
+    return transactions_page_response(page, (await session.exec(page_tags_statement(page))).all())
+
+
+@router.patch("/batch", response_model = List[TransactionRead])
+async def update_transactions(
+    batch: TransactionBatchUpdate,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(
+        lambda sync_session: transactions.update_transactions(batch, current_user, sync_session)
+    )
+
+
+@router.delete("/batch", response_model = TransactionBatchDeleteResult)
+async def delete_transactions(
+    batch: TransactionBatchDelete,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(
+        lambda sync_session: transactions.delete_transactions(batch, current_user, sync_session)
+    )
+
+
+@router.get("/{transaction_id}", response_model = TransactionRead)
+async def read_transaction(
+    transaction_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: Users = Depends(get_current_user)
+):
+    transaction = (await session.exec(transaction_with_tags_statement(transaction_id))).first()
+    if not transaction:
+        raise HTTPException(status_code = 404, detail = "Transaction not found")
+    if transaction.user_id != current_user.user_id:
+        raise HTTPException(status_code = 403, detail = "Not authorized to view this transaction")
+    return transaction
+
+
+@router.patch("/{transaction_id}", response_model = TransactionRead)
+async def update_transaction(
+    transaction_id: int,
+    upd: TransactionUpdate,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(
+        lambda sync_session: transactions.update_transaction(transaction_id, upd, current_user, sync_session)
+    )
+
+
+@router.delete("/{transaction_id}")
+async def delete_transaction(
+    transaction_id: int,
+    current_user: Users = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(
+        lambda sync_session: transactions.delete_transaction(transaction_id, current_user, sync_session)
+    )
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from connection import get_async_session
+from models import Users
+from typing import List
+from async_routers.auth import create_user_and_token
+from routers.auth import invalidate_user
+from routers.users import USER_COLUMNS, users_response
+from schemas import UserCreate, UserRead, UserUpdate, UserWithToken
+
+router = APIRouter(prefix = "/users", tags = ["Users"])
+
+
+@router.post("/", response_model = UserWithToken)
+async def create_user(user_create: UserCreate, session: AsyncSession = Depends(get_async_session)):
+    return await create_user_and_token(user_create, session)
+
+
+@router.get("/", response_model = List[UserRead])
+async def read_users(session: AsyncSession = Depends(get_async_session)):
+    return users_response((await session.exec(select(*USER_COLUMNS))).all())
+
+
+@router.get("/{user_id}", response_model = UserRead)
+async def read_user(user_id: int, session: AsyncSession = Depends(get_async_session)):
+    user = await session.get(Users, user_id)
+    if not user:
+        raise HTTPException(status_code = 404, detail = "User not found")
+    return user
+
+
+@router.patch("/{user_id}", response_model = UserRead)
+async def update_user(user_id: int, user_update: UserUpdate, session: AsyncSession = Depends(get_async_session)):
+    user = await session.get(Users, user_id)
+    if not user:
+        raise HTTPException(status_code = 404, detail = "User not found")
+    user_data = user_update.dict(exclude_unset = True)
+    for key, value in user_data.items():
+        setattr(user, key, value)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    invalidate_user(user.username)
+    return user
+
+
+@router.delete("/{user_id}")
+async def delete_user(user_id: int, session: AsyncSession = Depends(get_async_session)):
+    user = await session.get(Users, user_id)
+    if not user:
+        raise HTTPException(status_code = 404, detail = "User not found")
+    await session.delete(user)
+    await session.commit()
+    invalidate_user(user.username)
+    return {"message": "User deleted successfully"}
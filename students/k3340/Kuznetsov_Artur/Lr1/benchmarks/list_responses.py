@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+
+LR1_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LR1_DIR)
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, SQLModel, select
+
+from models import Budgets, Notifications, Tags, TransactionTags, Transactions, Users
+from routers.budgets import budgets_response, budgets_statement
+from routers.notifications import notifications_page, notifications_page_statement
+from routers.transactions import page_tags_statement, transactions_page, transactions_page_response
+from routers.transactions import transactions_page_statement
+from routers.users import USER_COLUMNS, users_response
+from schemas import BudgetRead, NotificationRead, TransactionFilters, TransactionRead, UserRead
+
+START = datetime(2024, 1, 1)
+
+
+def seed(engine, rows, tags):
+    rng = random.Random(0)
+    with engine.begin() as connection:
+        connection.execute(insert(Tags), [{"tag_id": tag_id, "name": f"tag {tag_id}"} for tag_id in range(1, tags + 1)])
+        connection.execute(insert(Users), [
+            {
+                "user_id": user_id,
+                "username": f"user{user_id}",
+                "password": "-",
+                "first_name": "Bench",
+                "last_name": "Mark",
+                "email": f"user{user_id}@example.com",
+            }
+            for user_id in range(1, rows + 1)
+        ])
+        connection.execute(insert(Budgets), [
+            {
+                "budget_id": budget_id,
+                "user_id": 1,
+                "category_id": budget_id,
+                "limit_amount": rng.randint(1, 100_000) / 100,
+                "start_date": START,
+                "end_date": START + timedelta(days = 365),
+                "total_spent": rng.randint(1, 100_000) / 100,
+                "description": "monthly",
+            }
+            for budget_id in range(1, rows + 1)
+        ])
+        connection.execute(insert(Notifications), [
+            {
+                "user_id": 1,
+                "budget_id": notification_id,
+                "message": "over budget",
+                "created_at": START + timedelta(minutes = notification_id),
+                "is_read": False,
+            }
+            for notification_id in range(1, rows + 1)
+        ])
+        connection.execute(insert(Transactions), [
+            {
+                "transaction_id": transaction_id,
+                "user_id": 1,
+                "transaction_type_id": 2,
+                "category_id": rng.randint(1, 12),
+                "amount": rng.randint(1, 100_000) / 100,
+                "date": START + timedelta(minutes = transaction_id),
+            }
+            for transaction_id in range(1, rows + 1)
+        ])
+        connection.execute(insert(TransactionTags), [
+            {"transaction_id": transaction_id, "tag_id": tag_id, "created_at": START}
+            for transaction_id in range(1, rows + 1)
+            for tag_id in rng.sample(range(1, tags + 1), 2)
+        ])
+
+
+def model_response(model, objects, page: bool = False) -> bytes:
+    adapter = TypeAdapter(List[model])
+    items = adapter.dump_python(adapter.validate_python(objects, from_attributes = True), mode = "json")
+    return json.dumps({"items": items, "next_cursor": None} if page else items).encode()
+
+
+def orm_paths(rows):
+    return {
+        "read_transactions": lambda session: model_response(
+            TransactionRead,
+            session.exec(
+                select(Transactions)
+                .where(Transactions.user_id == 1)
+                .order_by(Transactions.date.desc(), Transactions.transaction_id.desc())
+                .limit(rows)
+                .options(selectinload(Transactions.tags))
+            ).all(),
+            page = True
+        ),
+        "read_budgets": lambda session: model_response(
+            BudgetRead, session.exec(select(Budgets).where(Budgets.user_id == 1)).all()
+        ),
+        "read_notifications": lambda session: model_response(
+            NotificationRead,
+            session.exec(
+                select(Notifications)
+                .where(Notifications.user_id == 1)
+                .order_by(Notifications.created_at.desc(), Notifications.notification_id.desc())
+                .limit(rows)
+            ).all(),
+            page = True
+        ),
+        "read_users": lambda session: model_response(UserRead, session.exec(select(Users)).all()),
+    }
+
+
+def read_transactions(session, rows):
+    page = transactions_page(session.exec(transactions_page_statement(1, TransactionFilters(), None, rows)).all(), rows)
+    return transactions_page_response(page, session.exec(page_tags_statement(page)).all()).body
+
+
+def row_paths(rows):
+    return {
+        "read_transactions": lambda session: read_transactions(session, rows),
+        "read_budgets": lambda session: budgets_response(session.exec(budgets_statement(1)).all()).body,
+        "read_notifications": lambda session: notifications_page(
+            session.exec(notifications_page_statement(1, False, None, rows)).all(), rows
+        ).body,
+        "read_users": lambda session: users_response(session.exec(select(*USER_COLUMNS)).all()).body,
+    }
+
+
+def measure(engine, fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            body = fn(session)
+            timings.append(time.perf_counter() - started)
+    with Session(engine) as session:
+        tracemalloc.start()
+        fn(session)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return min(timings), peak, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare ORM row validation with column tuples and a precompiled TypeAdapter")
+    parser.add_argument("--db-url", default = "sqlite://", help = "an empty scratch database")
+    parser.add_argument("--rows", type = int, default = 10_000)
+    parser.add_argument("--tags", type = int, default = 8)
+    parser.add_argument("--repeat", type = int, default = 5)
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    SQLModel.metadata.create_all(engine)
+    seed(engine, args.rows, args.tags)
+
+    scale = 10_000 / args.rows
+    before, after = orm_paths(args.rows), row_paths(args.rows)
+    print(f"{'endpoint':<20}{'path':<8}{'ms/10k':>10}{'peak MiB/10k':>14}")
+    for route in before:
+        bodies = []
+        for label, fn in [("orm", before[route]), ("rows", after[route])]:
+            seconds, peak, body = measure(engine, fn, args.repeat)
+            bodies.append(json.loads(body))
+            print(f"{route:<20}{label:<8}{seconds * 1000 * scale:>10.1f}{peak / 2 ** 20 * scale:>14.1f}")
+        if bodies[0] != bodies[1]:
+            raise SystemExit(f"{route}: responses differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+LR1_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USER = {
+    "username": "bench",
+    "password": "bench",
+    "first_name": "Bench",
+    "last_name": "Mark",
+    "email": "bench@example.com",
+}
+
+
+def start_server(mode, port):
+    env = dict(os.environ, DB_MODE = mode)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd = LR1_DIR,
+        env = env,
+        stdout = subprocess.DEVNULL,
+        stderr = subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Server in {mode} mode did not start")
+
+
+def get_token(base_url):
+    response = httpx.post(f"{base_url}/auth/login", json = {"username": USER["username"], "password": USER["password"]})
+    if response.status_code != 200:
+        response = httpx.post(f"{base_url}/auth/register", json = USER)
+    return response.json()["access_token"]
+
+
+async def worker(client, path, headers, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(path, headers = headers)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def run_load(base_url, path, token, concurrency, duration):
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    errors = []
+    limits = httpx.Limits(max_connections = concurrency)
+    async with httpx.AsyncClient(base_url = base_url, limits = limits, timeout = 30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            worker(client, path, headers, deadline, latencies, errors) for _ in range(concurrency)
+        ))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare sync and async DB modes under load")
+    parser.add_argument("--path", default = "/transactions/?limit=50")
+    parser.add_argument("--concurrency", type = int, default = 64)
+    parser.add_argument("--duration", type = float, default = 10)
+    parser.add_argument("--port", type = int, default = 8765)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("sync", "async"):
+        process = start_server(mode, args.port)
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            token = get_token(base_url)
+            results[mode] = asyncio.run(run_load(base_url, args.path, token, args.concurrency, args.duration))
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(f"{'mode':<8}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<8}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.1f}"
+            f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import math
+import statistics
+import time
+
+import httpx
+
+from load import USER, get_token, start_server
+
+
+async def probe(client, path, headers, stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(path, headers = headers)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+
+async def login_worker(client, stop, statuses):
+    credentials = {"username": USER["username"], "password": USER["password"]}
+    while not stop.is_set():
+        response = await client.post("/auth/login", json = credentials)
+        statuses.append(response.status_code)
+        if response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    if not latencies:
+        return 0.0, 0.0
+    p99 = latencies[min(len(latencies) - 1, math.ceil(0.99 * len(latencies)) - 1)]
+    return statistics.median(latencies) * 1000, p99 * 1000
+
+
+async def run_phase(base_url, token, path, storm, duration):
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    statuses = []
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections = storm + 1)
+    async with httpx.AsyncClient(base_url = base_url, limits = limits, timeout = 60) as client:
+        tasks = [asyncio.create_task(probe(client, path, headers, stop, latencies))]
+        tasks += [asyncio.create_task(login_worker(client, stop, statuses)) for _ in range(storm)]
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+    return latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Measure endpoint latency during a login storm")
+    parser.add_argument("--mode", default = "sync", choices = ["sync", "async"])
+    parser.add_argument("--path", default = "/budgets/")
+    parser.add_argument("--storm", type = int, default = 100)
+    parser.add_argument("--duration", type = float, default = 10)
+    parser.add_argument("--port", type = int, default = 8766)
+    args = parser.parse_args()
+
+    process = start_server(args.mode, args.port)
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        token = get_token(base_url)
+        phases = {
+            "idle": asyncio.run(run_phase(base_url, token, args.path, 0, args.duration)),
+            "storm": asyncio.run(run_phase(base_url, token, args.path, args.storm, args.duration)),
+        }
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f"{'phase':<8}{'probe p50 ms':>14}{'probe p99 ms':>14}{'logins/s':>10}{'503s':>8}")
+    for phase, (latencies, statuses) in phases.items():
+        p50, p99 = summarize(latencies)
+        logins = sum(1 for status in statuses if status == 200) / args.duration
+        rejected = sum(1 for status in statuses if status == 503)
+        print(f"{phase:<8}{p50:>14.2f}{p99:>14.2f}{logins:>10.1f}{rejected:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+LR1_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LR1_DIR)
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, delete, func, insert, select, text
+from sqlmodel import SQLModel
+
+from models import (
+    Budgets, Categories, Notifications, Tags, TransactionTags, TransactionTypeEnums, TransactionTypes,
+    Transactions, Users
+)
+
+CHECKED_TABLES = {"transactions", "budgets", "notifications", "transactiontags"}
+START = datetime(2024, 1, 1)
+
+
+def seed(connection, users, transactions_per_user, categories, tags):
+    connection.execute(insert(TransactionTypes), [
+        {"transaction_type_id": 1, "name": TransactionTypeEnums.income},
+        {"transaction_type_id": 2, "name": TransactionTypeEnums.expense},
+    ])
+    connection.execute(insert(Categories), [
+        {"category_id": category_id, "name": f"category {category_id}", "transaction_type_id": 2}
+        for category_id in range(1, categories + 1)
+    ])
+    connection.execute(insert(Tags), [{"tag_id": tag_id, "name": f"tag {tag_id}"} for tag_id in range(1, tags + 1)])
+    connection.execute(insert(Users), [
+        {
+            "user_id": user_id,
+            "username": f"user{user_id}",
+            "password": "-",
+            "first_name": "Plan",
+            "last_name": "Check",
+            "email": f"user{user_id}@example.com",
+        }
+        for user_id in range(1, users + 1)
+    ])
+    connection.execute(insert(Budgets), [
+        {
+            "budget_id": (user_id - 1) * categories + category_id,
+            "user_id": user_id,
+            "category_id": category_id,
+            "limit_amount": 1000.0,
+            "start_date": START,
+            "end_date": START + timedelta(days = 365),
+            "total_spent": 0.0,
+        }
+        for user_id in range(1, users + 1)
+        for category_id in range(1, categories + 1)
+    ])
+    connection.execute(insert(Notifications), [
+        {
+            "user_id": user_id,
+            "budget_id": (user_id - 1) * categories + category_id,
+            "message": "over budget",
+            "created_at": START,
+            "is_read": category_id % 3 == 0,
+        }
+        for user_id in range(1, users + 1)
+        for category_id in range(1, categories + 1)
+    ])
+
+    rng = random.Random(0)
+    transaction_id = 0
+    for user_id in range(1, users + 1):
+        rows = []
+        links = []
+        for _ in range(transactions_per_user):
+            transaction_id += 1
+            rows.append({
+                "transaction_id": transaction_id,
+                "user_id": user_id,
+                "transaction_type_id": 2,
+                "category_id": rng.randint(1, categories),
+                "amount": round(rng.uniform(1, 100), 2),
+                "date": START + timedelta(minutes = rng.randint(0, 525600)),
+            })
+            for tag_id in rng.sample(range(1, tags + 1), 2):
+                links.append({"transaction_id": transaction_id, "tag_id": tag_id, "created_at": START})
+        connection.execute(insert(Transactions), rows)
+        connection.execute(insert(TransactionTags), links)
+    connection.execute(text("ANALYZE"))
+
+
+def route_statements():
+    return {
+        "update_total_spent": select(func.sum(Transactions.amount)).where(
+            Transactions.user_id == 7,
+            Transactions.category_id == 3,
+            Transactions.transaction_type_id == 2,
+            Transactions.date >= START,
+            Transactions.date <= START + timedelta(days = 90),
+        ),
+        "update_total_spent budget lookup": select(Budgets).where(Budgets.category_id == 3, Budgets.user_id == 7),
+        "read_notifications": select(Notifications)
+        .where(Notifications.user_id == 7, Notifications.is_read == False)
+        .order_by(Notifications.created_at.desc(), Notifications.notification_id.desc())
+        .limit(51),
+        "evaluate_budgets": delete(Notifications).where(Notifications.budget_id.in_([61, 62])),
+        "get_tag_ids": select(TransactionTags.tag_id).where(TransactionTags.transaction_id == 1234),
+        "read_transactions page tags": select(TransactionTags.transaction_id, Tags.name, Tags.tag_id)
+        .join(Tags, Tags.tag_id == TransactionTags.tag_id)
+        .where(TransactionTags.transaction_id.in_([1234, 1235, 1236]))
+        .order_by(TransactionTags.transaction_id, TransactionTags.tag_id),
+        "export_transactions": select(Transactions.transaction_id, Tags.name)
+        .outerjoin(TransactionTags, TransactionTags.transaction_id == Transactions.transaction_id)
+        .outerjoin(Tags, Tags.tag_id == TransactionTags.tag_id)
+        .where(Transactions.user_id == 7, Transactions.date >= START)
+        .order_by(Transactions.date, Transactions.transaction_id, TransactionTags.tag_id),
+        "read_transaction_tags": select(TransactionTags).join(Transactions).where(Transactions.user_id == 7),
+        "read_transactions tag filter": select(Transactions).where(
+            Transactions.user_id == 7,
+            Transactions.transaction_id.in_(select(TransactionTags.transaction_id).where(TransactionTags.tag_id == 2)),
+        ),
+    }
+
+
+def explain(connection, statement):
+    compiled = statement.compile(dialect = connection.dialect, compile_kwargs = {"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return postgres_seq_scans(plan[0]["Plan"])
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return sqlite_seq_scans([row[-1] for row in rows])
+
+
+def postgres_seq_scans(node):
+    scans = []
+    if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in CHECKED_TABLES:
+        scans.append(node["Relation Name"])
+    for child in node.get("Plans", []):
+        scans.extend(postgres_seq_scans(child))
+    return scans
+
+
+def sqlite_seq_scans(details):
+    scans = []
+    for detail in details:
+        words = detail.split()
+        if len(words) > 1 and words[0] == "SCAN" and words[1] in CHECKED_TABLES and "INDEX" not in words:
+            scans.append(words[1])
+    return scans
+
+
+def upgrade_schema(engine) -> list:
+    config = Config(os.path.join(LR1_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(LR1_DIR, "migrations"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        return compare_metadata(MigrationContext.configure(connection), SQLModel.metadata)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Fail if hot routes fall back to sequential scans")
+    parser.add_argument("--db-url", default = "sqlite://", help = "an empty scratch database")
+    parser.add_argument("--users", type = int, default = 200)
+    parser.add_argument("--transactions-per-user", type = int, default = 500)
+    parser.add_argument("--categories", type = int, default = 12)
+    parser.add_argument("--tags", type = int, default = 8)
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    drift = upgrade_schema(engine)
+    for difference in drift:
+        print(f"{'FAIL':<6}{'migrations match models':<36}{difference}")
+    failures = len(drift)
+    with engine.connect() as connection:
+        seed(connection, args.users, args.transactions_per_user, args.categories, args.tags)
+        for route, statement in route_statements().items():
+            scans = explain(connection, statement)
+            status = "FAIL" if scans else "ok"
+            failures += bool(scans)
+            print(f"{status:<6}{route:<36}{', '.join(scans)}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+LR1_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LR1_DIR)
+
+from sqlalchemy import create_engine, insert, select
+from sqlmodel import Session, SQLModel
+
+from models import Transactions
+from routers.reports import aggregate_range, range_statement
+from schemas import SummaryGroup
+
+
+def seed(engine, rows):
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(insert(Transactions), [
+            {
+                "user_id": 1,
+                "transaction_type_id": rng.randint(1, 2),
+                "category_id": rng.randint(1, 12),
+                "amount": rng.randint(1, 100_000) / 100,
+                "date": start + timedelta(minutes = rng.randint(0, 525600)),
+            }
+            for _ in range(rows)
+        ])
+
+
+def float_summary(session, date_from, date_to):
+    totals = defaultdict(float)
+    statement = select(Transactions.category_id, Transactions.transaction_type_id, Transactions.amount).where(
+        Transactions.user_id == 1, Transactions.date >= date_from, Transactions.date <= date_to
+    )
+    for category_id, type_id, amount in session.exec(statement):
+        totals[(category_id, type_id)] += float(amount)
+    return sum(totals.values())
+
+
+def numpy_summary(session, date_from, date_to):
+    rows = session.exec(range_statement(1, SummaryGroup.category, date_from, date_to)).all()
+    return sum(group["total"] for group in aggregate_range(rows, SummaryGroup.category))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare per-row float sums with the NumPy minor-unit path")
+    parser.add_argument("--db-url", default = "sqlite://", help = "an empty scratch database")
+    parser.add_argument("--rows", type = int, default = 500_000)
+    parser.add_argument("--repeat", type = int, default = 3)
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    SQLModel.metadata.create_all(engine)
+    seed(engine, args.rows)
+    date_from, date_to = datetime(2024, 1, 15, 12), datetime(2024, 12, 20, 12)
+
+    with Session(engine) as session:
+        for label, fn in [("python floats", float_summary), ("numpy int64", numpy_summary)]:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                total = fn(session, date_from, date_to)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"{label:<14}{min(timings):>9.1f}ms total={total!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+LR1_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LR1_DIR)
+
+import httpx
+from sqlmodel import SQLModel
+
+from connection import engine, seed_defaults
+from migrate import check_schema, migrate
+from reference_data import reference_data
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def cold_start(schema_mode, port):
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd = LR1_DIR,
+        env = dict(os.environ, DB_SCHEMA = schema_mode),
+        stdout = subprocess.DEVNULL,
+        stderr = subprocess.DEVNULL,
+    )
+    try:
+        while process.poll() is None:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/")
+                return (time.perf_counter() - started) * 1000
+            except httpx.TransportError:
+                time.sleep(0.01)
+        raise RuntimeError(f"Server with DB_SCHEMA={schema_mode} exited during startup")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type = int, default = 20)
+    parser.add_argument("--cold-repeat", type = int, default = 5)
+    parser.add_argument("--port", type = int, default = 8010)
+    args = parser.parse_args()
+
+    migrate()
+    for label, fn in [
+        ("create_all", lambda: SQLModel.metadata.create_all(engine)),
+        ("schema check", check_schema),
+        ("seed (forced)", lambda: seed_defaults(force = True)),
+        ("seed (unchanged)", seed_defaults),
+        ("reference load", reference_data.refresh),
+    ]:
+        p50, worst = measure(fn, args.repeat)
+        print(f"{label:<18} p50={p50:.2f}ms max={worst:.2f}ms")
+
+    for schema_mode in ["create_all", "migrations"]:
+        timings = [cold_start(schema_mode, args.port) for _ in range(args.cold_repeat)]
+        print(f"cold start ({schema_mode}) p50={statistics.median(timings):.0f}ms max={max(timings):.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
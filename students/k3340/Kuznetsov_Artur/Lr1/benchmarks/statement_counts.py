@@ -0,0 +1,149 @@
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+LR1_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LR1_DIR)
+
+START = datetime(2024, 1, 1)
+ROUTES = [
+    ("transactions list", lambda user: f"/transactions/?limit={user['size']}"),
+    ("transaction detail", lambda user: f"/transactions/{user['transaction_id']}"),
+    ("notifications list", lambda user: f"/notifications/?limit={user['size']}"),
+    ("budgets list", lambda user: "/budgets/"),
+    ("users list", lambda user: "/users/"),
+]
+
+
+def register(client, size):
+    response = client.post("/auth/register", json = {
+        "username": f"count{size}",
+        "password": "count",
+        "first_name": "Count",
+        "last_name": "Statements",
+        "email": f"count{size}@example.com",
+    })
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def seed_user(engine, username, size, tag_ids):
+    from sqlalchemy import insert
+    from sqlmodel import Session, select
+    from models import Budgets, Categories, Notifications, TransactionTags, Transactions, Users
+
+    with Session(engine) as session:
+        user_id = session.exec(select(Users.user_id).where(Users.username == username)).one()
+        category = session.exec(select(Categories).where(Categories.name == "groceries")).one()
+        session.exec(insert(Transactions), params = [
+            {
+                "user_id": user_id,
+                "transaction_type_id": category.transaction_type_id,
+                "category_id": category.category_id,
+                "amount": 10,
+                "date": START + timedelta(hours = i),
+            }
+            for i in range(size)
+        ])
+        transaction_ids = session.exec(
+            select(Transactions.transaction_id).where(Transactions.user_id == user_id).order_by(Transactions.date)
+        ).all()
+        session.exec(insert(TransactionTags), params = [
+            {"transaction_id": transaction_id, "tag_id": tag_id}
+            for transaction_id in transaction_ids
+            for tag_id in tag_ids[:2]
+        ] + [
+            {"transaction_id": transaction_ids[0], "tag_id": tag_id} for tag_id in tag_ids[2:size]
+        ])
+        session.exec(insert(Budgets), params = [
+            {
+                "user_id": user_id,
+                "category_id": category.category_id,
+                "limit_amount": 100,
+                "start_date": START,
+                "end_date": START + timedelta(days = 30),
+            }
+            for _ in range(size)
+        ])
+        session.exec(insert(Notifications), params = [
+            {"user_id": user_id, "message": f"notification {i}", "created_at": START + timedelta(minutes = i)}
+            for i in range(size)
+        ])
+        session.commit()
+    return transaction_ids[0]
+
+
+def seed_tags(engine, count):
+    from sqlalchemy import insert
+    from sqlmodel import Session, select
+    from models import Tags
+
+    with Session(engine) as session:
+        session.exec(insert(Tags), params = [{"name": f"count tag {i}"} for i in range(count)])
+        session.commit()
+        return session.exec(select(Tags.tag_id).order_by(Tags.tag_id)).all()
+
+
+def count_statements(client, counted_engine, path, headers):
+    from sqlalchemy import event
+
+    client.get(path, headers = headers).raise_for_status()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(counted_engine, "before_cursor_execute", record)
+    try:
+        client.get(path, headers = headers).raise_for_status()
+    finally:
+        event.remove(counted_engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [5, 50, 200])
+    parser.add_argument("--db-url", help = "scratch database, a temporary SQLite file by default")
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    os.environ["DB_ADMIN"] = args.db_url or f"sqlite:///{os.path.join(scratch.name, 'counts.sqlite')}"
+    os.chdir(LR1_DIR)
+
+    from fastapi.testclient import TestClient
+    import connection
+    import main as app_main
+    from migrate import migrate
+
+    migrate()
+    counted_engine = connection.async_engine.sync_engine if connection.async_engine is not None else connection.engine
+    sizes = sorted(args.sizes)
+    counts = {}
+    with TestClient(app_main.app) as client:
+        tag_ids = seed_tags(connection.engine, max(sizes))
+        for size in sizes:
+            headers = {"Authorization": f"Bearer {register(client, size)}"}
+            user = {"size": size, "transaction_id": seed_user(connection.engine, f"count{size}", size, tag_ids)}
+            for name, path in ROUTES:
+                counts[name, size] = count_statements(client, counted_engine, path(user), headers)
+
+    print(f"{'route':<22}" + "".join(f"{f'N={size}':>8}" for size in sizes))
+    failures = []
+    for name, _ in ROUTES:
+        row = [counts[name, size] for size in sizes]
+        print(f"{name:<22}" + "".join(f"{count:>8}" for count in row))
+        if row[-1] > row[0]:
+            failures.append(name)
+    scratch.cleanup()
+
+    if failures:
+        print(f"statement count grows with N: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"ok: statement counts are constant in {connection.DB_MODE} mode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+LR1_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LR1_DIR)
+
+RANGES = [
+    (None, None),
+    (datetime(2024, 1, 1), None),
+    (None, datetime(2024, 5, 1)),
+    (datetime(2024, 3, 1), datetime(2024, 6, 1)),
+    (datetime(2024, 2, 1), datetime(2024, 2, 1)),
+    (datetime(2024, 12, 1), datetime(2025, 1, 1)),
+    (datetime(2024, 6, 1), datetime(2024, 3, 1)),
+]
+
+
+def transaction_dates(rng, count):
+    months = [datetime(2024, month, 1) for month in range(1, 13)] + [datetime(2025, 1, 1)]
+    dates = []
+    for month in months:
+        dates.append(month)
+        dates.append(month - timedelta(microseconds = 1))
+        dates.append(month + timedelta(microseconds = 1))
+    while len(dates) < count:
+        dates.append(datetime(2024, 1, 1) + timedelta(seconds = rng.randrange(366 * 24 * 3600)))
+    return dates
+
+
+def seed(session, rows):
+    from sqlalchemy import insert
+    from sqlmodel import select
+    from models import Categories, Tags, TransactionTags, Transactions, Users
+
+    rng = random.Random(0)
+    user = Users(username = "summary", password = "-", first_name = "Sum", last_name = "Mary", email = "s@example.com")
+    session.add(user)
+    session.flush()
+    categories = session.exec(select(Categories)).all()
+    tag_ids = session.exec(select(Tags.tag_id)).all()
+    transactions = []
+    for date in transaction_dates(rng, rows):
+        category = rng.choice(categories)
+        transactions.append({
+            "user_id": user.user_id,
+            "transaction_type_id": category.transaction_type_id,
+            "category_id": category.category_id,
+            "amount": rng.randint(1, 100000) / 100,
+            "date": date,
+        })
+    session.exec(insert(Transactions), params = transactions)
+    transaction_ids = session.exec(select(Transactions.transaction_id).where(Transactions.user_id == user.user_id)).all()
+    session.exec(insert(TransactionTags), params = [
+        {"transaction_id": transaction_id, "tag_id": tag_id}
+        for transaction_id in transaction_ids
+        for tag_id in rng.sample(tag_ids, rng.randint(0, 2))
+    ])
+    session.commit()
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type = int, default = 2000)
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    os.environ["DB_ADMIN"] = f"sqlite:///{os.path.join(scratch.name, 'summary.sqlite')}"
+
+    from sqlmodel import Session
+    import connection
+    from migrate import migrate
+    from routers.reports import aggregate_range, range_statement, read_summary, rebuild_rollups, SUMMARY_KEYS
+    from schemas import SummaryGroup
+
+    migrate()
+    mismatches = 0
+    with Session(connection.engine) as session:
+        user = seed(session, args.rows)
+        rebuild_rollups(session)
+        for group_by in SummaryGroup:
+            for date_from, date_to in RANGES:
+                served = read_summary(date_from, date_to, group_by, current_user = user, session = session)
+                raw = aggregate_range(
+                    session.exec(range_statement(user.user_id, group_by, date_from, date_to)).all(), group_by
+                )
+                key = lambda row: (row[SUMMARY_KEYS[group_by]], row["transaction_type_id"])
+                expected = sorted(raw, key = key)
+                same = [(key(row), row["total"], row["count"]) for row in served] == [
+                    (key(row), row["total"], row["count"]) for row in expected
+                ]
+                mismatches += not same
+                print(f"{'ok' if same else 'MISMATCH':<9}{group_by.value:<10}from={date_from}  to={date_to}  rows={len(served)}")
+    scratch.cleanup()
+
+    if mismatches:
+        print(f"{mismatches} range(s) differ between the rollup and raw paths")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,43 @@
+import hashlib
+import json
 import os
+import sys
+from datetime import datetime
 from dotenv import load_dotenv
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import SQLModel, Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from models import Categories, Tags, TransactionTypeEnums, TransactionTypes
+from models import Categories, SeedVersions, Tags, TransactionTypeEnums, TransactionTypes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from db_settings import engine_options, instrument_pool, pool_metrics
 
 load_dotenv()
 db_url = os.getenv("DB_ADMIN")
-engine = create_engine(db_url, echo = True)
+engine = instrument_pool(create_engine(db_url, **engine_options(db_url)))
+DB_MODE = os.getenv("DB_MODE", "sync")
+DB_SCHEMA = os.getenv("DB_SCHEMA", "migrations")
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_db_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+async_db_url = os.getenv("DB_ADMIN_ASYNC") or get_async_db_url(db_url)
+async_engine = (
+    create_async_engine(async_db_url, **engine_options(async_db_url, is_async = True))
+    if DB_MODE == "async" else None
+)
+if async_engine is not None:
+    instrument_pool(async_engine.sync_engine)
+SEED_NAME = "defaults"
 DEFAULT_TAGS = ["impulse_buy", "planned_buy", "cash", "card"]
 DEFAULT_TRANSACTION_TYPES = ["income", "expense"]
 DEFAULT_CATEGORIES = {
@@ -25,62 +56,88 @@ DEFAULT_CATEGORIES = {
 }
 
 
-def init_db():
-    SQLModel.metadata.create_all(engine)
-    init_default_tags()
-    init_default_transaction_types()
-    init_default_categories()
+def dialect_insert(model, session: Session):
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
 
 
-def init_default_tags():
-    with Session(engine) as session:
-        for tag_name in DEFAULT_TAGS:
-            tag_exists = session.exec(select(Tags).where(Tags.name == tag_name)).first()
-            if not tag_exists:
-                session.add(Tags(name = tag_name))
-        session.commit()
+def get_seed_version() -> str:
+    payload = json.dumps([DEFAULT_TAGS, DEFAULT_TRANSACTION_TYPES, DEFAULT_CATEGORIES], sort_keys = True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
 
 
-def init_default_transaction_types():
-    with Session(engine) as session:
-        for tt_name in DEFAULT_TRANSACTION_TYPES:
-            type_exists = session.exec(
-                select(TransactionTypes).where(TransactionTypes.name == tt_name)
-            ).first()
-            if not type_exists:
-                session.add(TransactionTypes(name=tt_name))
-        session.commit()
+def init_db():
+    SQLModel.metadata.create_all(engine)
+    seed_defaults()
 
 
-def init_default_categories():
+def seed_defaults(force: bool = False) -> bool:
+    version = get_seed_version()
     with Session(engine) as session:
-        for tx_type_str, categories in DEFAULT_CATEGORIES.items():
-            tx_type = session.exec(
-                select(TransactionTypes).where(TransactionTypes.name == TransactionTypeEnums(tx_type_str))
-            ).first()
-
-            if not tx_type:
-                continue
-
-            for category in categories:
-                exists = session.exec(
-                    select(Categories).where(
-                        Categories.name == category["name"],
-                        Categories.transaction_type_id == tx_type.transaction_type_id
-                    )
-                ).first()
-
-                if not exists:
-                    session.add(
-                        Categories(
-                            name = category["name"],
-                            transaction_type_id = tx_type.transaction_type_id
-                        )
-                    )
-
+        seeded = session.exec(select(SeedVersions.version).where(SeedVersions.name == SEED_NAME)).first()
+        if seeded == version and not force:
+            return False
+
+        init_default_tags(session)
+        init_default_transaction_types(session)
+        init_default_categories(session)
+
+        statement = dialect_insert(SeedVersions, session).values(
+            name = SEED_NAME, version = version, seeded_at = datetime.utcnow()
+        )
+        session.exec(statement.on_conflict_do_update(
+            index_elements = ["name"],
+            set_ = {"version": statement.excluded.version, "seeded_at": statement.excluded.seeded_at}
+        ))
         session.commit()
+        return True
+
+
+def init_default_tags(session: Session):
+    session.exec(
+        dialect_insert(Tags, session)
+        .values([{"name": tag_name} for tag_name in DEFAULT_TAGS])
+        .on_conflict_do_nothing(index_elements = ["name"])
+    )
+
+
+def init_default_transaction_types(session: Session):
+    session.exec(
+        dialect_insert(TransactionTypes, session)
+        .values([{"name": TransactionTypeEnums(tt_name)} for tt_name in DEFAULT_TRANSACTION_TYPES])
+        .on_conflict_do_nothing(index_elements = ["name"])
+    )
+
+
+def init_default_categories(session: Session):
+    type_ids = {
+        name: type_id
+        for type_id, name in session.exec(select(TransactionTypes.transaction_type_id, TransactionTypes.name)).all()
+    }
+    rows = [
+        {"name": category["name"], "transaction_type_id": type_ids[TransactionTypeEnums(tx_type_str)]}
+        for tx_type_str, categories in DEFAULT_CATEGORIES.items()
+        if TransactionTypeEnums(tx_type_str) in type_ids
+        for category in categories
+    ]
+    if rows:
+        session.exec(
+            dialect_insert(Categories, session)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements = ["name", "transaction_type_id"])
+        )
 
 
 def get_session():
     with Session(engine) as session:
+        with pool_metrics.timed_acquire():
+            session.connection()
+        yield session
+
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit = False) as session:
+        with pool_metrics.timed_acquire():
+            await session.connection()
         yield session
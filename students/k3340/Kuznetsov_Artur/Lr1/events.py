@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import select
+import threading
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Set
+
+from fastapi import Request
+from sqlalchemy import text
+
+from connection import engine
+
+NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "local")
+NOTIFICATION_QUEUE_SIZE = int(os.getenv("NOTIFICATION_QUEUE_SIZE", "100"))
+NOTIFICATION_HEARTBEAT = float(os.getenv("NOTIFICATION_HEARTBEAT", "15"))
+NOTIFICATION_CHANNEL = "budget_notifications"
+
+
+class Subscription:
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(queue_size)
+
+    def deliver(self, payload: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(payload)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class LocalBroker:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        with self.lock:
+            self.subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            subscribers = self.subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscribers[subscription.user_id]
+
+    def publish(self, user_id: int, payload: dict):
+        self.dispatch(user_id, payload)
+
+    def dispatch(self, user_id: int, payload: dict):
+        with self.lock:
+            subscribers = list(self.subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, payload)
+
+    def close(self):
+        pass
+
+
+class PostgresBroker(LocalBroker):
+    def __init__(self, queue_size: int):
+        super().__init__(queue_size)
+        self.listener = None
+        self.stopped = threading.Event()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target = self.listen, name = "notification-listener", daemon = True)
+                self.listener.start()
+        return super().subscribe(user_id)
+
+    def publish(self, user_id: int, payload: dict):
+        message = json.dumps({"user_id": user_id, "payload": payload})
+        with engine.begin() as connection:
+            connection.execute(text("SELECT pg_notify(:channel, :message)"), {
+                "channel": NOTIFICATION_CHANNEL,
+                "message": message,
+            })
+
+    def listen(self):
+        connection = engine.raw_connection()
+        try:
+            driver_connection = connection.driver_connection
+            driver_connection.autocommit = True
+            driver_connection.cursor().execute(f"LISTEN {NOTIFICATION_CHANNEL}")
+            while not self.stopped.is_set():
+                if select.select([driver_connection], [], [], 1.0) == ([], [], []):
+                    continue
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    message = json.loads(driver_connection.notifies.pop(0).payload)
+                    self.dispatch(message["user_id"], message["payload"])
+        finally:
+            connection.invalidate()
+
+    def close(self):
+        self.stopped.set()
+
+
+notification_broker = (
+    PostgresBroker(NOTIFICATION_QUEUE_SIZE) if NOTIFICATION_BROKER == "postgres"
+    else LocalBroker(NOTIFICATION_QUEUE_SIZE)
+)
+
+
+async def notification_events(request: Request, user_id: int) -> AsyncIterator[str]:
+    subscription = notification_broker.subscribe(user_id)
+    try:
+        while True:
+            try:
+                payload = await asyncio.wait_for(subscription.get(), NOTIFICATION_HEARTBEAT)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: notification\nid: {payload['notification_id']}\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        notification_broker.unsubscribe(subscription)
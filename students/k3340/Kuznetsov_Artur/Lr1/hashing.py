@@ -0,0 +1,81 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", str(PASSWORD_WORKERS * 2)))
+PASSWORD_START_METHOD = os.getenv(
+    "PASSWORD_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+pwd_context = CryptContext(schemes = ["bcrypt"], deprecated = "auto")
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.slots = threading.BoundedSemaphore(workers + queue_limit)
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def start(self, start_method: str = PASSWORD_START_METHOD):
+        with self.lock:
+            if self.executor is not None:
+                return
+            context = multiprocessing.get_context(start_method)
+            if start_method == "forkserver":
+                context.set_forkserver_preload([__name__])
+            self.executor = ProcessPoolExecutor(max_workers = self.workers, mp_context = context)
+            for future in [self.executor.submit(abs, 0) for _ in range(self.workers)]:
+                future.result()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            raise RuntimeError("Password hasher is not started")
+        return self.executor
+
+    def submit(self, fn, *args) -> Future:
+        if not self.slots.acquire(blocking = False):
+            raise HTTPException(
+                status_code = 503,
+                detail = "Too many password operations in progress",
+                headers = {"Retry-After": "1"}
+            )
+        try:
+            future = self.get_executor().submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures = True)
+                self.executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_WORKERS, PASSWORD_QUEUE_LIMIT)
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(password_hasher.submit(_hash, password))
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(password_hasher.submit(_verify, password, hashed_password))
@@ -1,20 +1,46 @@
-from fastapi import FastAPI
-
-from connection import init_db
-from routers import auth, budgets, categories, notifications, tags, transactions, users
+from fastapi import Depends, FastAPI
+
+from connection import DB_MODE, DB_SCHEMA, init_db, pool_metrics
+from events import notification_broker
+from hashing import password_hasher
+from migrate import check_schema
+from models import Users
+from reference_data import reference_data
+from routers import categories, tags
+from routers.budgets import BUDGET_ACCOUNTING, budget_evaluator, start_reconciliation
+
+if DB_MODE == "async":
+    from async_routers import auth, budgets, notifications, reports, transactions, users
+else:
+    from routers import auth, budgets, notifications, reports, transactions, users
 
 app = FastAPI()
 
 
 @app.on_event("startup")
 def on_startup():
-    init_db()
+    if DB_SCHEMA == "create_all":
+        init_db()
+    else:
+        check_schema()
+    reference_data.refresh()
+    password_hasher.start()
+    if BUDGET_ACCOUNTING == "incremental":
+        start_reconciliation()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    password_hasher.shutdown()
+    budget_evaluator.stop()
+    notification_broker.close()
 
 
 app.include_router(auth.router)
 app.include_router(budgets.router)
 app.include_router(categories.router)
 app.include_router(notifications.router)
+app.include_router(reports.router)
 app.include_router(tags.router)
 app.include_router(transactions.router)
 app.include_router(users.router)
@@ -23,3 +49,8 @@ app.include_router(users.router)
 @app.get("/")
 def hello():
     return "Hello, Artur!"
+
+
+@app.get("/metrics/pool")
+def read_pool_metrics(current_user: Users = Depends(auth.get_current_user)):
+    return pool_metrics.snapshot()
@@ -0,0 +1,64 @@
+import argparse
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlmodel import SQLModel
+
+from connection import engine, seed_defaults
+
+LR1_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATION_LOCK_KEY = 3340_0001
+
+
+class SchemaOutdatedError(RuntimeError):
+    pass
+
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(LR1_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(LR1_DIR, "migrations"))
+    return config
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def check_schema():
+    head = head_revision()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    if current != head:
+        raise SchemaOutdatedError(
+            f"Database schema is at revision {current}, expected {head}; run `python migrate.py` first"
+        )
+
+
+def migrate(revision: str = "head"):
+    config = alembic_config()
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        config.attributes["connection"] = connection
+        if not inspect(connection).get_table_names():
+            SQLModel.metadata.create_all(connection)
+            command.stamp(config, "head")
+        else:
+            command.upgrade(config, revision)
+    seed_defaults()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Upgrade the database schema and seed reference defaults")
+    parser.add_argument("revision", nargs = "?", default = "head")
+    args = parser.parse_args()
+
+    migrate(args.revision)
+
+
+if __name__ == "__main__":
+    main()
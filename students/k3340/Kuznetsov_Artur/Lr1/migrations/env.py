@@ -63,6 +63,16 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection = connection, target_metadata = target_metadata
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = create_engine(os.getenv("DB_ADMIN"))
 
     with connectable.connect() as connection:
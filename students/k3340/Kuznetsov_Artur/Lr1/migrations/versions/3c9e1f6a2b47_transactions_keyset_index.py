@@ -0,0 +1,33 @@
+"""transactions keyset index
+
+Revision ID: 3c9e1f6a2b47
+Revises: b73ba3d1eb67
+Create Date: 2025-05-12 19:04:11.382516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f6a2b47'
+down_revision: Union[str, None] = 'b73ba3d1eb67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transactions_user_id_date_transaction_id',
+        'transactions',
+        ['user_id', 'date', 'transaction_id'],
+        unique = False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_user_id_date_transaction_id', table_name = 'transactions')
@@ -0,0 +1,59 @@
+"""filter indexes
+
+Revision ID: 5e8b2d7f4a19
+Revises: a41f5b0c7e23
+Create Date: 2025-05-28 12:04:51.380215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b2d7f4a19'
+down_revision: Union[str, None] = 'a41f5b0c7e23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transactions_user_id_category_id_transaction_type_id_date',
+        'transactions',
+        ['user_id', 'category_id', 'transaction_type_id', 'date'],
+        unique = False
+    )
+    op.create_index('ix_budgets_user_id_category_id', 'budgets', ['user_id', 'category_id'], unique = False)
+    op.create_index(
+        'ix_notifications_user_id_is_read_notification_id',
+        'notifications',
+        ['user_id', 'is_read', 'notification_id'],
+        unique = False
+    )
+    op.create_index('ix_notifications_budget_id', 'notifications', ['budget_id'], unique = False)
+    op.execute(sa.text(
+        "DELETE FROM transactiontags WHERE transaction_tag_id NOT IN "
+        "(SELECT MIN(transaction_tag_id) FROM transactiontags GROUP BY transaction_id, tag_id)"
+    ))
+    with op.batch_alter_table('transactiontags') as batch_op:
+        batch_op.create_unique_constraint('uq_transactiontags_transaction_id_tag_id', ['transaction_id', 'tag_id'])
+    op.create_index(
+        'ix_transactiontags_tag_id_transaction_id',
+        'transactiontags',
+        ['tag_id', 'transaction_id'],
+        unique = False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactiontags_tag_id_transaction_id', table_name = 'transactiontags')
+    with op.batch_alter_table('transactiontags') as batch_op:
+        batch_op.drop_constraint('uq_transactiontags_transaction_id_tag_id', type_ = 'unique')
+    op.drop_index('ix_notifications_budget_id', table_name = 'notifications')
+    op.drop_index('ix_notifications_user_id_is_read_notification_id', table_name = 'notifications')
+    op.drop_index('ix_budgets_user_id_category_id', table_name = 'budgets')
+    op.drop_index('ix_transactions_user_id_category_id_transaction_type_id_date', table_name = 'transactions')
@@ -0,0 +1,83 @@
+"""report rollups
+
+Revision ID: 7d2a4c8e91f0
+Revises: 3c9e1f6a2b47
+Create Date: 2025-05-20 20:11:47.905133
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a4c8e91f0'
+down_revision: Union[str, None] = '3c9e1f6a2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTH_EXPRESSIONS = {
+    'postgresql': "date_trunc('month', t.date)",
+    'sqlite': "strftime('%Y-%m-01 00:00:00.000000', t.date)",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'transactionrollups',
+        sa.Column('rollup_id', sa.Integer(), nullable = False),
+        sa.Column('user_id', sa.Integer(), nullable = True),
+        sa.Column('month', sa.DateTime(), nullable = False),
+        sa.Column('category_id', sa.Integer(), nullable = True),
+        sa.Column('transaction_type_id', sa.Integer(), nullable = True),
+        sa.Column('total', sa.Float(), nullable = False),
+        sa.Column('count', sa.Integer(), nullable = False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.category_id']),
+        sa.ForeignKeyConstraint(['transaction_type_id'], ['transactiontypes.transaction_type_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('rollup_id'),
+        sa.UniqueConstraint(
+            'user_id', 'month', 'category_id', 'transaction_type_id',
+            name = 'uq_transactionrollups_user_month_category_type'
+        )
+    )
+    op.create_table(
+        'tagrollups',
+        sa.Column('rollup_id', sa.Integer(), nullable = False),
+        sa.Column('user_id', sa.Integer(), nullable = True),
+        sa.Column('month', sa.DateTime(), nullable = False),
+        sa.Column('tag_id', sa.Integer(), nullable = True),
+        sa.Column('transaction_type_id', sa.Integer(), nullable = True),
+        sa.Column('total', sa.Float(), nullable = False),
+        sa.Column('count', sa.Integer(), nullable = False),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.tag_id']),
+        sa.ForeignKeyConstraint(['transaction_type_id'], ['transactiontypes.transaction_type_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('rollup_id'),
+        sa.UniqueConstraint(
+            'user_id', 'month', 'tag_id', 'transaction_type_id',
+            name = 'uq_tagrollups_user_month_tag_type'
+        )
+    )
+    month = MONTH_EXPRESSIONS[op.get_bind().dialect.name]
+    op.execute(sa.text(
+        "INSERT INTO transactionrollups (user_id, month, category_id, transaction_type_id, total, count) "
+        f"SELECT t.user_id, {month}, t.category_id, t.transaction_type_id, SUM(t.amount), COUNT(*) "
+        f"FROM transactions t GROUP BY t.user_id, {month}, t.category_id, t.transaction_type_id"
+    ))
+    op.execute(sa.text(
+        "INSERT INTO tagrollups (user_id, month, tag_id, transaction_type_id, total, count) "
+        f"SELECT t.user_id, {month}, tt.tag_id, t.transaction_type_id, SUM(t.amount), COUNT(*) "
+        "FROM transactions t "
+        "JOIN (SELECT DISTINCT transaction_id, tag_id FROM transactiontags) tt "
+        "ON tt.transaction_id = t.transaction_id "
+        f"GROUP BY t.user_id, {month}, tt.tag_id, t.transaction_type_id"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tagrollups')
+    op.drop_table('transactionrollups')
@@ -0,0 +1,52 @@
+"""money numeric
+
+Revision ID: 9b3f6c1d2e58
+Revises: 5e8b2d7f4a19
+Create Date: 2025-05-29 10:47:13.662508
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f6c1d2e58'
+down_revision: Union[str, None] = '5e8b2d7f4a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONEY_COLUMNS = [
+    ('transactions', 'amount'),
+    ('budgets', 'limit_amount'),
+    ('budgets', 'total_spent'),
+    ('transactionrollups', 'total'),
+    ('tagrollups', 'total'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in MONEY_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type = sa.Float(),
+                type_ = sa.Numeric(14, 2),
+                existing_nullable = False,
+                postgresql_using = f'round({column}::numeric, 2)'
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in MONEY_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type = sa.Numeric(14, 2),
+                type_ = sa.Float(),
+                existing_nullable = False,
+                postgresql_using = f'{column}::double precision'
+            )
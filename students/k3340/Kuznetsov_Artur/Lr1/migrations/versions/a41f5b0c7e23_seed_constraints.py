@@ -0,0 +1,115 @@
+"""seed constraints
+
+Revision ID: a41f5b0c7e23
+Revises: 7d2a4c8e91f0
+Create Date: 2025-05-27 18:32:09.114672
+
+"""
+from typing import Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f5b0c7e23'
+down_revision: Union[str, None] = '7d2a4c8e91f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table, key column, unique columns, referencing (table, column) pairs
+DEDUPLICATED = [
+    (
+        'transactiontypes', 'transaction_type_id', ['name'],
+        [('categories', 'transaction_type_id'), ('transactions', 'transaction_type_id')]
+    ),
+    (
+        'categories', 'category_id', ['name', 'transaction_type_id'],
+        [('transactions', 'category_id'), ('budgets', 'category_id')]
+    ),
+    ('tags', 'tag_id', ['name'], [('transactiontags', 'tag_id')]),
+]
+MONTH_EXPRESSIONS = {
+    'postgresql': "date_trunc('month', t.date)",
+    'sqlite': "strftime('%Y-%m-01 00:00:00.000000', t.date)",
+}
+
+
+def duplicates_query(table: str, key: str, columns: Sequence[str]) -> str:
+    match = " AND ".join(f"s.{column} = d.{column}" for column in columns)
+    return f"SELECT d.{key} FROM {table} d JOIN {table} s ON {match} AND s.{key} < d.{key}"
+
+
+def merge_duplicates(table: str, key: str, columns: Sequence[str], references: Sequence[Tuple[str, str]]):
+    duplicates = duplicates_query(table, key, columns)
+    match = " AND ".join(f"s.{column} = d.{column}" for column in columns)
+    for ref_table, ref_column in references:
+        op.execute(sa.text(
+            f"UPDATE {ref_table} SET {ref_column} = "
+            f"(SELECT MIN(s.{key}) FROM {table} s JOIN {table} d ON {match} WHERE d.{key} = {ref_table}.{ref_column}) "
+            f"WHERE {ref_column} IN ({duplicates})"
+        ))
+    op.execute(sa.text(f"DELETE FROM {table} WHERE {key} IN ({duplicates})"))
+
+
+def rebuild_rollups():
+    month = MONTH_EXPRESSIONS[op.get_bind().dialect.name]
+    op.execute(sa.text(
+        "INSERT INTO transactionrollups (user_id, month, category_id, transaction_type_id, total, count) "
+        f"SELECT t.user_id, {month}, t.category_id, t.transaction_type_id, SUM(t.amount), COUNT(*) "
+        f"FROM transactions t GROUP BY t.user_id, {month}, t.category_id, t.transaction_type_id"
+    ))
+    op.execute(sa.text(
+        "INSERT INTO tagrollups (user_id, month, tag_id, transaction_type_id, total, count) "
+        f"SELECT t.user_id, {month}, tt.tag_id, t.transaction_type_id, SUM(t.amount), COUNT(*) "
+        "FROM transactions t "
+        "JOIN (SELECT DISTINCT transaction_id, tag_id FROM transactiontags) tt "
+        "ON tt.transaction_id = t.transaction_id "
+        f"GROUP BY t.user_id, {month}, tt.tag_id, t.transaction_type_id"
+    ))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    has_duplicates = any(
+        bind.execute(sa.text(duplicates_query(table, key, columns))).first() is not None
+        for table, key, columns, _ in DEDUPLICATED
+    )
+    if has_duplicates:
+        op.execute(sa.text("DELETE FROM tagrollups"))
+        op.execute(sa.text("DELETE FROM transactionrollups"))
+        for table, key, columns, references in DEDUPLICATED:
+            merge_duplicates(table, key, columns, references)
+        rebuild_rollups()
+        op.execute(sa.text(
+            "UPDATE budgets SET total_spent = COALESCE(("
+            "SELECT SUM(t.amount) FROM transactions t "
+            "JOIN transactiontypes tt ON tt.transaction_type_id = t.transaction_type_id "
+            "WHERE tt.name = 'expense' AND t.user_id = budgets.user_id AND t.category_id = budgets.category_id "
+            "AND t.date BETWEEN budgets.start_date AND budgets.end_date), 0)"
+        ))
+    with op.batch_alter_table('tags') as batch_op:
+        batch_op.create_unique_constraint('uq_tags_name', ['name'])
+    with op.batch_alter_table('transactiontypes') as batch_op:
+        batch_op.create_unique_constraint('uq_transactiontypes_name', ['name'])
+    with op.batch_alter_table('categories') as batch_op:
+        batch_op.create_unique_constraint('uq_categories_name_transaction_type_id', ['name', 'transaction_type_id'])
+    op.create_table(
+        'seedversions',
+        sa.Column('name', sa.String(), nullable = False),
+        sa.Column('version', sa.String(), nullable = False),
+        sa.Column('seeded_at', sa.DateTime(), nullable = False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('seedversions')
+    with op.batch_alter_table('categories') as batch_op:
+        batch_op.drop_constraint('uq_categories_name_transaction_type_id', type_ = 'unique')
+    with op.batch_alter_table('transactiontypes') as batch_op:
+        batch_op.drop_constraint('uq_transactiontypes_name', type_ = 'unique')
+    with op.batch_alter_table('tags') as batch_op:
+        batch_op.drop_constraint('uq_tags_name', type_ = 'unique')
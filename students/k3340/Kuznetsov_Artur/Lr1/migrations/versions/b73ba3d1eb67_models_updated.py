@@ -1,5 +1,8 @@
 """models updated
 
+Creates the baseline schema that earlier deployments built with create_all;
+databases that already have it are left untouched.
+
 Revision ID: b73ba3d1eb67
 Revises: 
 Create Date: 2025-04-19 18:39:30.015021
@@ -20,13 +23,102 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    if sa.inspect(op.get_bind()).has_table('users'):
+        return
+    op.create_table(
+        'users',
+        sa.Column('user_id', sa.Integer(), nullable = False),
+        sa.Column('username', sa.String(), nullable = False),
+        sa.Column('password', sa.String(), nullable = False),
+        sa.Column('first_name', sa.String(), nullable = False),
+        sa.Column('last_name', sa.String(), nullable = False),
+        sa.Column('email', sa.String(), nullable = False),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_users_username', 'users', ['username'], unique = True)
+    op.create_index('ix_users_email', 'users', ['email'], unique = True)
+    op.create_table(
+        'transactiontypes',
+        sa.Column('transaction_type_id', sa.Integer(), nullable = False),
+        sa.Column('name', sa.Enum('income', 'expense', name = 'transactiontypeenums'), nullable = False),
+        sa.PrimaryKeyConstraint('transaction_type_id')
+    )
+    op.create_table(
+        'tags',
+        sa.Column('tag_id', sa.Integer(), nullable = False),
+        sa.Column('name', sa.String(), nullable = False),
+        sa.PrimaryKeyConstraint('tag_id')
+    )
+    op.create_table(
+        'categories',
+        sa.Column('category_id', sa.Integer(), nullable = False),
+        sa.Column('transaction_type_id', sa.Integer(), nullable = True),
+        sa.Column('name', sa.String(), nullable = False),
+        sa.ForeignKeyConstraint(['transaction_type_id'], ['transactiontypes.transaction_type_id']),
+        sa.PrimaryKeyConstraint('category_id')
+    )
+    op.create_table(
+        'budgets',
+        sa.Column('budget_id', sa.Integer(), nullable = False),
+        sa.Column('user_id', sa.Integer(), nullable = True),
+        sa.Column('category_id', sa.Integer(), nullable = True),
+        sa.Column('limit_amount', sa.Float(), nullable = False),
+        sa.Column('start_date', sa.DateTime(), nullable = False),
+        sa.Column('end_date', sa.DateTime(), nullable = False),
+        sa.Column('description', sa.String(), nullable = True),
+        sa.Column('total_spent', sa.Float(), nullable = False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.category_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('budget_id')
+    )
+    op.create_table(
+        'transactions',
+        sa.Column('transaction_id', sa.Integer(), nullable = False),
+        sa.Column('user_id', sa.Integer(), nullable = True),
+        sa.Column('transaction_type_id', sa.Integer(), nullable = True),
+        sa.Column('category_id', sa.Integer(), nullable = True),
+        sa.Column('amount', sa.Float(), nullable = False),
+        sa.Column('date', sa.DateTime(), nullable = False),
+        sa.Column('description', sa.String(), nullable = True),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.category_id']),
+        sa.ForeignKeyConstraint(['transaction_type_id'], ['transactiontypes.transaction_type_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('transaction_id')
+    )
+    op.create_table(
+        'notifications',
+        sa.Column('notification_id', sa.Integer(), nullable = False),
+        sa.Column('user_id', sa.Integer(), nullable = True),
+        sa.Column('budget_id', sa.Integer(), nullable = True),
+        sa.Column('message', sa.String(), nullable = False),
+        sa.Column('created_at', sa.DateTime(), nullable = False),
+        sa.Column('is_read', sa.Boolean(), nullable = False),
+        sa.ForeignKeyConstraint(['budget_id'], ['budgets.budget_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('notification_id')
+    )
+    op.create_table(
+        'transactiontags',
+        sa.Column('transaction_tag_id', sa.Integer(), nullable = False),
+        sa.Column('tag_id', sa.Integer(), nullable = True),
+        sa.Column('transaction_id', sa.Integer(), nullable = True),
+        sa.Column('created_at', sa.DateTime(), nullable = False),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.tag_id']),
+        sa.ForeignKeyConstraint(['transaction_id'], ['transactions.transaction_id']),
+        sa.PrimaryKeyConstraint('transaction_tag_id')
+    )
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    op.drop_table('transactiontags')
+    op.drop_table('notifications')
+    op.drop_table('transactions')
+    op.drop_table('budgets')
+    op.drop_table('categories')
+    op.drop_table('tags')
+    op.drop_table('transactiontypes')
+    op.drop_index('ix_users_email', table_name = 'users')
+    op.drop_index('ix_users_username', table_name = 'users')
+    op.drop_table('users')
+    sa.Enum(name = 'transactiontypeenums').drop(op.get_bind(), checkfirst = True)
@@ -0,0 +1,59 @@
+"""notification counters
+
+Revision ID: c62d8e4f1a37
+Revises: 9b3f6c1d2e58
+Create Date: 2025-05-30 16:21:40.508913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c62d8e4f1a37'
+down_revision: Union[str, None] = '9b3f6c1d2e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notificationcounters',
+        sa.Column('user_id', sa.Integer(), nullable = False),
+        sa.Column('unread', sa.Integer(), nullable = False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete = 'CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute(sa.text(
+        "INSERT INTO notificationcounters (user_id, unread) "
+        "SELECT user_id, COUNT(*) FROM notifications WHERE NOT is_read AND user_id IS NOT NULL GROUP BY user_id"
+    ))
+    op.drop_index('ix_notifications_user_id_is_read_notification_id', table_name = 'notifications')
+    op.create_index(
+        'ix_notifications_user_id_created_at_notification_id',
+        'notifications',
+        ['user_id', 'created_at', 'notification_id'],
+        unique = False
+    )
+    op.create_index(
+        'ix_notifications_user_id_is_read_created_at_notification_id',
+        'notifications',
+        ['user_id', 'is_read', 'created_at', 'notification_id'],
+        unique = False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_user_id_is_read_created_at_notification_id', table_name = 'notifications')
+    op.drop_index('ix_notifications_user_id_created_at_notification_id', table_name = 'notifications')
+    op.create_index(
+        'ix_notifications_user_id_is_read_notification_id',
+        'notifications',
+        ['user_id', 'is_read', 'notification_id'],
+        unique = False
+    )
+    op.drop_table('notificationcounters')
@@ -0,0 +1,43 @@
+"""unique budget notifications
+
+Revision ID: e4a7c1b9d305
+Revises: c62d8e4f1a37
+Create Date: 2025-06-02 11:47:26.318405
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c1b9d305'
+down_revision: Union[str, None] = 'c62d8e4f1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DUPLICATES = (
+    "SELECT d.notification_id FROM notifications d "
+    "JOIN notifications s ON s.budget_id = d.budget_id AND s.notification_id < d.notification_id"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.execute(sa.text(DUPLICATES)).first() is not None:
+        op.execute(sa.text(f"DELETE FROM notifications WHERE notification_id IN ({DUPLICATES})"))
+        op.execute(sa.text("DELETE FROM notificationcounters"))
+        op.execute(sa.text(
+            "INSERT INTO notificationcounters (user_id, unread) "
+            "SELECT user_id, COUNT(*) FROM notifications WHERE NOT is_read AND user_id IS NOT NULL GROUP BY user_id"
+        ))
+    op.drop_index('ix_notifications_budget_id', table_name = 'notifications')
+    op.create_index('ix_notifications_budget_id', 'notifications', ['budget_id'], unique = True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_budget_id', table_name = 'notifications')
+    op.create_index('ix_notifications_budget_id', 'notifications', ['budget_id'], unique = False)
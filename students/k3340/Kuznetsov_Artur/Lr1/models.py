@@ -1,8 +1,12 @@
 from typing import Optional, List
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 
+from money import MONEY_DIGITS, MONEY_PLACES, ZERO
+
 
 class Users(SQLModel, table = True):
     user_id: Optional[int] = Field(default = None, primary_key = True)
@@ -23,6 +27,8 @@ class TransactionTypeEnums(str, Enum):
 
 
 class TransactionTypes(SQLModel, table = True):
+    __table_args__ = (UniqueConstraint("name", name = "uq_transactiontypes_name"),)
+
     transaction_type_id: Optional[int] = Field(default = None, primary_key = True)
     name: TransactionTypeEnums
 
@@ -31,6 +37,10 @@ class TransactionTypes(SQLModel, table = True):
 
 
 class Categories(SQLModel, table = True):
+    __table_args__ = (
+        UniqueConstraint("name", "transaction_type_id", name = "uq_categories_name_transaction_type_id"),
+    )
+
     category_id: Optional[int] = Field(default = None, primary_key = True)
     transaction_type_id: Optional[int] = Field(default = None, foreign_key = "transactiontypes.transaction_type_id")
     name: str
@@ -41,14 +51,18 @@ class Categories(SQLModel, table = True):
 
 
 class Budgets(SQLModel, table = True):
+    __table_args__ = (
+        Index("ix_budgets_user_id_category_id", "user_id", "category_id"),
+    )
+
     budget_id: Optional[int] = Field(default = None, primary_key = True)
     user_id: Optional[int] = Field(foreign_key = "users.user_id")
     category_id: Optional[int] = Field(foreign_key = "categories.category_id")
-    limit_amount: float
+    limit_amount: Decimal = Field(max_digits = MONEY_DIGITS, decimal_places = MONEY_PLACES)
     start_date: datetime
     end_date: datetime
     description: Optional[str] = None
-    total_spent: float = Field(default = 0.0)
+    total_spent: Decimal = Field(default = ZERO, max_digits = MONEY_DIGITS, decimal_places = MONEY_PLACES)
 
     user: Optional["Users"] = Relationship(back_populates = "budgets")
     category: Optional["Categories"] = Relationship(back_populates = "budgets")
@@ -56,6 +70,15 @@ class Budgets(SQLModel, table = True):
 
 
 class Notifications(SQLModel, table = True):
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at_notification_id", "user_id", "created_at", "notification_id"),
+        Index(
+            "ix_notifications_user_id_is_read_created_at_notification_id",
+            "user_id", "is_read", "created_at", "notification_id"
+        ),
+        Index("ix_notifications_budget_id", "budget_id", unique = True),
+    )
+
     notification_id: Optional[int] = Field(default = None, primary_key = True)
     user_id: Optional[int] = Field(foreign_key = "users.user_id")
     budget_id: Optional[int] = Field(foreign_key = "budgets.budget_id")
@@ -67,7 +90,17 @@ class Notifications(SQLModel, table = True):
     budget: Optional["Budgets"] = Relationship(back_populates = "notifications")
 
 
+class NotificationCounters(SQLModel, table = True):
+    user_id: int = Field(primary_key = True, foreign_key = "users.user_id", ondelete = "CASCADE")
+    unread: int = Field(default = 0)
+
+
 class TransactionTags(SQLModel, table = True):
+    __table_args__ = (
+        UniqueConstraint("transaction_id", "tag_id", name = "uq_transactiontags_transaction_id_tag_id"),
+        Index("ix_transactiontags_tag_id_transaction_id", "tag_id", "transaction_id"),
+    )
+
     transaction_tag_id: Optional[int] = Field(default = None, primary_key = True)
     tag_id: Optional[int] = Field(foreign_key = "tags.tag_id")
     transaction_id: Optional[int] = Field(foreign_key = "transactions.transaction_id")
@@ -75,6 +108,8 @@ class TransactionTags(SQLModel, table = True):
 
 
 class Tags(SQLModel, table = True):
+    __table_args__ = (UniqueConstraint("name", name = "uq_tags_name"),)
+
     tag_id: Optional[int] = Field(default = None, primary_key = True)
     name: str
 
@@ -82,11 +117,19 @@ class Tags(SQLModel, table = True):
 
 
 class Transactions(SQLModel, table = True):
+    __table_args__ = (
+        Index("ix_transactions_user_id_date_transaction_id", "user_id", "date", "transaction_id"),
+        Index(
+            "ix_transactions_user_id_category_id_transaction_type_id_date",
+            "user_id", "category_id", "transaction_type_id", "date"
+        ),
+    )
+
     transaction_id: Optional[int] = Field(default = None, primary_key = True)
     user_id: Optional[int] = Field(foreign_key = "users.user_id")
     transaction_type_id: Optional[int] = Field(foreign_key = "transactiontypes.transaction_type_id")
     category_id: Optional[int] = Field(foreign_key = "categories.category_id")
-    amount: float
+    amount: Decimal = Field(max_digits = MONEY_DIGITS, decimal_places = MONEY_PLACES)
     date: datetime
     description: Optional[str] = None
 
@@ -94,3 +137,43 @@ class Transactions(SQLModel, table = True):
     transaction_type: Optional["TransactionTypes"] = Relationship(back_populates = "transactions")
     category: Optional["Categories"] = Relationship(back_populates = "transactions")
     tags: List["Tags"] = Relationship(back_populates = "transactions", link_model = TransactionTags)
+
+
+class TransactionRollups(SQLModel, table = True):
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "month", "category_id", "transaction_type_id",
+            name = "uq_transactionrollups_user_month_category_type"
+        ),
+    )
+
+    rollup_id: Optional[int] = Field(default = None, primary_key = True)
+    user_id: Optional[int] = Field(foreign_key = "users.user_id")
+    month: datetime
+    category_id: Optional[int] = Field(foreign_key = "categories.category_id")
+    transaction_type_id: Optional[int] = Field(foreign_key = "transactiontypes.transaction_type_id")
+    total: Decimal = Field(default = ZERO, max_digits = MONEY_DIGITS, decimal_places = MONEY_PLACES)
+    count: int = Field(default = 0)
+
+
+class TagRollups(SQLModel, table = True):
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "month", "tag_id", "transaction_type_id",
+            name = "uq_tagrollups_user_month_tag_type"
+        ),
+    )
+
+    rollup_id: Optional[int] = Field(default = None, primary_key = True)
+    user_id: Optional[int] = Field(foreign_key = "users.user_id")
+    month: datetime
+    tag_id: Optional[int] = Field(foreign_key = "tags.tag_id")
+    transaction_type_id: Optional[int] = Field(foreign_key = "transactiontypes.transaction_type_id")
+    total: Decimal = Field(default = ZERO, max_digits = MONEY_DIGITS, decimal_places = MONEY_PLACES)
+    count: int = Field(default = 0)
+
+
+class SeedVersions(SQLModel, table = True):
+    name: str = Field(primary_key = True)
+    version: str
+    seeded_at: datetime = Field(default_factory = datetime.utcnow)
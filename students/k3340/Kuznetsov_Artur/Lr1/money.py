@@ -0,0 +1,24 @@
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import Field, PlainSerializer
+from sqlalchemy import BigInteger, cast, func
+
+MONEY_DIGITS = 14
+MONEY_PLACES = 2
+MINOR_UNITS = 10 ** MONEY_PLACES
+ZERO = Decimal(0)
+
+Money = Annotated[
+    Decimal,
+    Field(max_digits = MONEY_DIGITS, decimal_places = MONEY_PLACES),
+    PlainSerializer(float, return_type = float, when_used = "json"),
+]
+
+
+def minor_units(column):
+    return cast(func.round(column * MINOR_UNITS), BigInteger)
+
+
+def from_minor(value: int) -> Decimal:
+    return Decimal(int(value)).scaleb(-MONEY_PLACES)
@@ -0,0 +1,19 @@
+import argparse
+
+from sqlmodel import Session
+
+from connection import engine
+from routers.reports import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Rebuild report rollups from the transactions table")
+    parser.add_argument("--user-id", type = int, default = None)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        rebuild_rollups(session, args.user_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from sqlmodel import Session, select
+
+from connection import engine
+from models import Categories, Tags, TransactionTypeEnums, TransactionTypes
+from schemas import CategoryRead, TagRead
+
+REFERENCE_MAX_AGE = int(os.getenv("REFERENCE_MAX_AGE", "300"))
+
+
+class ReferenceSnapshot:
+    def __init__(
+        self,
+        categories: Dict[int, CategoryRead],
+        tags: Dict[int, TagRead],
+        transaction_types: Dict[int, TransactionTypeEnums]
+    ):
+        self.categories = categories
+        self.tags = tags
+        self.transaction_types = transaction_types
+        self.expense_type_id = next(
+            (type_id for type_id, name in transaction_types.items() if name == TransactionTypeEnums.expense),
+            None
+        )
+        self.loaded_at = datetime.utcnow()
+        payload = json.dumps(
+            {
+                "categories": [category.model_dump() for category in categories.values()],
+                "tags": [tag.model_dump() for tag in tags.values()],
+                "transaction_types": {str(type_id): name.value for type_id, name in transaction_types.items()},
+            },
+            sort_keys = True
+        )
+        self.version = hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def is_expense(self, transaction_type_id: Optional[int]) -> bool:
+        return transaction_type_id is not None and transaction_type_id == self.expense_type_id
+
+
+class ReferenceData:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot: Optional[ReferenceSnapshot] = None
+
+    def load(self, session: Session) -> ReferenceSnapshot:
+        categories = session.exec(select(Categories).order_by(Categories.category_id)).all()
+        tags = session.exec(select(Tags).order_by(Tags.tag_id)).all()
+        transaction_types = session.exec(select(TransactionTypes)).all()
+        snapshot = ReferenceSnapshot(
+            {category.category_id: CategoryRead.model_validate(category) for category in categories},
+            {tag.tag_id: TagRead.model_validate(tag) for tag in tags},
+            {tt.transaction_type_id: TransactionTypeEnums(tt.name) for tt in transaction_types}
+        )
+        with self.lock:
+            self.snapshot = snapshot
+        return snapshot
+
+    def refresh(self) -> ReferenceSnapshot:
+        with Session(engine) as session:
+            return self.load(session)
+
+    def get(self) -> ReferenceSnapshot:
+        snapshot = self.snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+
+
+reference_data = ReferenceData()
+
+
+def not_modified(request: Request, response: Response, version: str) -> Optional[Response]:
+    etag = f'"{version}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={REFERENCE_MAX_AGE}"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code = 304, headers = headers)
+    response.headers.update(headers)
+    return None
@@ -1,11 +1,15 @@
 import datetime
 import os
 import jwt
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, Security, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session, select
-from passlib.context import CryptContext
+from cache import TTLCache
 from connection import get_session
+from hashing import hash_password_async, verify_password_async
 from models import Users
 from schemas import UserCreate, UserRead, UserLogin, UserPassword, UserWithToken
 
@@ -14,9 +18,12 @@ router = APIRouter(prefix = "/auth", tags = ["Authentication"])
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
 
-pwd_context = CryptContext(schemes = ["bcrypt"], deprecated = "auto")
 auth_scheme = HTTPBearer()
+token_cache = TTLCache(maxsize = USER_CACHE_SIZE, ttl = ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+user_cache = TTLCache(maxsize = USER_CACHE_SIZE, ttl = USER_CACHE_TTL)
 
 
 def create_access_token(data: dict, expires_delta: datetime.timedelta = None) -> str:
@@ -33,16 +40,39 @@ def create_access_token(data: dict, expires_delta: datetime.timedelta = None) ->
 
 
 def verify_token(token: str) -> str:
+    username = token_cache.get(token)
+    if username is not None:
+        return username
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms = [ALGORITHM])
-        return payload.get("sub")
+        username = payload.get("sub")
+        if username is not None:
+            token_cache.set(token, username, expires_at = payload.get("exp"))
+        return username
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code = status.HTTP_401_UNAUTHORIZED, detail = "Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code = status.HTTP_401_UNAUTHORIZED, detail = "Invalid token")
 
 
-def create_user_with_hash(user_create: UserCreate, session: Session) -> Users:
+def cache_user(user: Users):
+    user_cache.set(user.username, user.model_dump())
+
+
+def invalidate_user(username: str):
+    user_cache.delete(username)
+
+
+def get_cached_user(username: str) -> Optional[Users]:
+    data = user_cache.get(username)
+    if data is None:
+        return None
+    user = Users(**data)
+    make_transient_to_detached(user)
+    return user
+
+
+def check_new_user(user_create: UserCreate, session: Session):
     username_statement = select(Users).where(Users.username == user_create.username)
     existing_user = session.exec(username_statement).first()
     if existing_user:
@@ -52,9 +82,10 @@ def create_user_with_hash(user_create: UserCreate, session: Session) -> Users:
     existing_email = session.exec(email_statement).first()
     if existing_email:
         raise HTTPException(status_code = 400, detail = "Email already registered")
+    session.close()
 
-    hashed_password = pwd_context.hash(user_create.password)
 
+def save_new_user(user_create: UserCreate, hashed_password: str, session: Session) -> Users:
     new_user = Users(
         username = user_create.username,
         password = hashed_password,
@@ -68,22 +99,33 @@ def create_user_with_hash(user_create: UserCreate, session: Session) -> Users:
     return new_user
 
 
-def create_user_and_token(user_create: UserCreate, session: Session) -> UserWithToken:
-    user = create_user_with_hash(user_create, session)
+async def create_user_with_hash(user_create: UserCreate, session: Session) -> Users:
+    await run_in_threadpool(check_new_user, user_create, session)
+    hashed_password = await hash_password_async(user_create.password)
+    return await run_in_threadpool(save_new_user, user_create, hashed_password, session)
+
+
+async def create_user_and_token(user_create: UserCreate, session: Session) -> UserWithToken:
+    user = await create_user_with_hash(user_create, session)
     token = create_access_token(data = {"sub": user.username})
     return UserWithToken(user = UserRead.model_validate(user), access_token = token)
 
 
 @router.post("/register", response_model = UserWithToken)
-def register(user_create: UserCreate, session: Session = Depends(get_session)):
-    return create_user_and_token(user_create, session)
+async def register(user_create: UserCreate, session: Session = Depends(get_session)):
+    return await create_user_and_token(user_create, session)
+
+
+def get_user_by_username(username: str, session: Session) -> Optional[Users]:
+    user = session.exec(select(Users).where(Users.username == username)).first()
+    session.close()
+    return user
 
 
 @router.post("/login", response_model = UserWithToken)
-def login(user_login: UserLogin, session: Session = Depends(get_session)):
-    statement = select(Users).where(Users.username == user_login.username)
-    user = session.exec(statement).first()
-    if not user or not pwd_context.verify(user_login.password, user.password):
+async def login(user_login: UserLogin, session: Session = Depends(get_session)):
+    user = await run_in_threadpool(get_user_by_username, user_login.username, session)
+    if not user or not await verify_password_async(user_login.password, user.password):
         raise HTTPException(status_code = 401, detail = "Invalid credentials")
     token = create_access_token(data = {"sub": user.username})
     return {
@@ -99,9 +141,13 @@ def get_current_user(
 ) -> Users:
     token = credentials.credentials
     username = verify_token(token)
+    user = get_cached_user(username)
+    if user:
+        return session.merge(user, load = False)
     statement = select(Users).where(Users.username == username)
     user = session.exec(statement).first()
     if not user: raise HTTPException(status_code = 404, detail = "User not found")
+    cache_user(user)
     return user
 
 
@@ -110,15 +156,22 @@ def read_current_user(current_user: Users = Depends(get_current_user)):
     return current_user
 
 
+def save_password(user: Users, hashed_password: str, session: Session):
+    user.password = hashed_password
+    session.add(user)
+    session.commit()
+    invalidate_user(user.username)
+
+
 @router.patch("/change-password")
-def change_password(
+async def change_password(
     pwd_data: UserPassword,
     current_user: Users = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    if not pwd_context.verify(pwd_data.old_password, current_user.password):
+    await run_in_threadpool(session.close)
+    if not await verify_password_async(pwd_data.old_password, current_user.password):
         raise HTTPException(status_code = 400, detail = "Incorrect current password")
-    current_user.password = pwd_context.hash(pwd_data.new_password)
-    session.add(current_user)
-    session.commit()
+    hashed_password = await hash_password_async(pwd_data.new_password)
+    await run_in_threadpool(save_password, current_user, hashed_password, session)
     return {"message": "Password updated successfully"}
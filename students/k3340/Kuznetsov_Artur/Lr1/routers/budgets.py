@@ -1,13 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import delete, func
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import and_, case, delete, func, or_, tuple_, update
 from sqlmodel import Session, select
-from connection import get_session
-from models import Budgets, Categories, Notifications, TransactionTypeEnums, TransactionTypes, Transactions, Users
-from schemas import BudgetCreate, BudgetRead, BudgetUpdate
+from connection import dialect_insert, engine, get_session
+from events import notification_broker
+from models import Budgets, Notifications, Transactions, Users
+from money import ZERO
+from reference_data import reference_data
+from schemas import BudgetCreate, BudgetRead, BudgetUpdate, NotificationRead
+from serialization import RowSerializer, read_columns
 from routers.auth import get_current_user
-from typing import List
+from routers.notifications import adjust_unread, unread_deltas
+from typing import Iterable, List, Optional, Set, Tuple
 
 router = APIRouter(prefix = "/budgets", tags = ["Budgets"])
+logger = logging.getLogger(__name__)
+
+BUDGET_ACCOUNTING = os.getenv("BUDGET_ACCOUNTING", "incremental")
+BUDGET_RECONCILE_INTERVAL = int(os.getenv("BUDGET_RECONCILE_INTERVAL", "300"))
+BUDGET_NOTIFICATIONS = os.getenv("BUDGET_NOTIFICATIONS", "background")
+BUDGET_EVALUATION_BATCH = int(os.getenv("BUDGET_EVALUATION_BATCH", "500"))
+BUDGET_EVALUATION_DELAY = float(os.getenv("BUDGET_EVALUATION_DELAY", "0.1"))
+BUDGET_EVALUATION_RETRY = float(os.getenv("BUDGET_EVALUATION_RETRY", "5"))
+RECONCILE_LOCK_KEY = 3340_0002
+BUDGET_COLUMNS = read_columns(Budgets, BudgetRead)
+budget_list_serializer = RowSerializer(List[BudgetRead])
+
+# (category_id, amount, date) of an expense transaction
+BudgetEntry = Tuple[int, Decimal, datetime]
+# (user_id, category_id) whose budgets need their thresholds re-evaluated
+BudgetKey = Tuple[int, int]
 
 
 @router.post("/", response_model = BudgetRead)
@@ -16,10 +43,11 @@ def create_budget(
     current_user: Users = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    category = session.get(Categories, budget.category_id)
+    snapshot = reference_data.get()
+    category = snapshot.categories.get(budget.category_id)
     if not category:
         raise HTTPException(status_code = 404, detail = "Category not found")
-    if category.transaction_type.name != TransactionTypeEnums.expense:
+    if not snapshot.is_expense(category.transaction_type_id):
         raise HTTPException(status_code = 400, detail = "Budget can only be set for expense categories")
 
     db_budget = Budgets(
@@ -43,14 +71,20 @@ def create_budget(
     return db_budget
 
 
+def budgets_statement(user_id: int):
+    return select(*BUDGET_COLUMNS).where(Budgets.user_id == user_id)
+
+
+def budgets_response(rows: list) -> Response:
+    return budget_list_serializer.response([dict(row._mapping) for row in rows])
+
+
 @router.get("/", response_model = List[BudgetRead])
 def read_budgets(
     current_user: Users = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    statement = select(Budgets).where(Budgets.user_id == current_user.user_id)
-    budgets = session.exec(statement).all()
-    return budgets
+    return budgets_response(session.exec(budgets_statement(current_user.user_id)).all())
 
 
 @router.get("/{budget_id}", response_model = BudgetRead)
@@ -68,9 +102,7 @@ def read_budget(
 
 
 def update_total_spent(category_id: int, user_id: int, session: Session):
-    expense_type = session.exec(
-        select(TransactionTypes).where(TransactionTypes.name == TransactionTypeEnums.expense)
-    ).first()
+    expense_type_id = reference_data.get().expense_type_id
 
     budgets = session.exec(
         select(Budgets).where(
@@ -84,42 +116,286 @@ def update_total_spent(category_id: int, user_id: int, session: Session):
             select(func.sum(Transactions.amount)).where(
                 Transactions.user_id == budget.user_id,
                 Transactions.category_id == budget.category_id,
-                Transactions.transaction_type_id == expense_type.transaction_type_id,
+                Transactions.transaction_type_id == expense_type_id,
                 Transactions.date.between(budget.start_date, budget.end_date)
             )
         ).first()
 
-        total = total if total is not None else 0.0
-
-        budget.total_spent = total
+        budget.total_spent = total if total is not None else ZERO
         session.add(budget)
 
-        if total <= budget.limit_amount:
-            session.exec(
-                delete(Notifications).where(
-                    Notifications.user_id == budget.user_id,
-                    Notifications.budget_id == budget.budget_id
-                )
-            )
-        else:
-            exists = session.exec(
-                select(Notifications).where(
-                    Notifications.user_id == budget.user_id,
-                    Notifications.budget_id == budget.budget_id
-                )
-            ).first()
-            if not exists:
-                session.add(
-                    Notifications(
-                        user_id = budget.user_id,
-                        budget_id = budget.budget_id,
-                        message = (
-                            f"Бюджет по категории «{budget.category.name}» превышен: "
-                            f"потрачено {total}, лимит {budget.limit_amount}"
-                        )
-                    )
-                )
+    commit_budget_changes({(user_id, category_id)}, session)
+
+
+def evaluate_budgets(keys: Iterable[BudgetKey], session: Session) -> List[NotificationRead]:
+    keys = list(keys)
+    if not keys:
+        return []
+    session.flush()
+
+    snapshot = reference_data.get()
+    spent = func.coalesce(func.sum(Transactions.amount), ZERO)
+    budgets = session.exec(
+        select(Budgets.budget_id, Budgets.user_id, Budgets.category_id, Budgets.limit_amount, spent)
+        .outerjoin(Transactions, and_(
+            Transactions.user_id == Budgets.user_id,
+            Transactions.category_id == Budgets.category_id,
+            Transactions.transaction_type_id == snapshot.expense_type_id,
+            Transactions.date.between(Budgets.start_date, Budgets.end_date)
+        ))
+        .where(tuple_(Budgets.user_id, Budgets.category_id).in_(keys))
+        .group_by(Budgets.budget_id, Budgets.user_id, Budgets.category_id, Budgets.limit_amount)
+    ).all()
+    exceeded = [budget for budget in budgets if budget[4] > budget[3]]
+    within = [budget[0] for budget in budgets if budget[4] <= budget[3]]
+
+    if within:
+        removed = session.exec(
+            delete(Notifications)
+            .where(Notifications.budget_id.in_(within))
+            .returning(Notifications.user_id, Notifications.is_read)
+        ).all()
+        adjust_unread(unread_deltas(removed, -1), session)
+
+    if exceeded:
+        created_at = datetime.utcnow()
+        notifications = {
+            budget_id: {
+                "user_id": user_id,
+                "budget_id": budget_id,
+                "message": (
+                    f"Бюджет по категории «{snapshot.categories[category_id].name}» превышен: "
+                    f"потрачено {total_spent}, лимит {limit_amount}"
+                ),
+                "created_at": created_at,
+                "is_read": False,
+            }
+            for budget_id, user_id, category_id, limit_amount, total_spent in exceeded
+        }
+        statement = dialect_insert(Notifications, session).values(list(notifications.values()))
+        upserted = session.exec(
+            statement.on_conflict_do_update(
+                index_elements = ["budget_id"],
+                set_ = {"message": statement.excluded.message},
+                where = Notifications.message != statement.excluded.message
+            ).returning(Notifications.notification_id, Notifications.budget_id, Notifications.created_at)
+        ).all()
+        # refreshed rows keep their original created_at, so only this batch's timestamp marks an insert
+        created = [
+            NotificationRead(notification_id = notification_id, **notifications[budget_id])
+            for notification_id, budget_id, row_created_at in upserted
+            if row_created_at == created_at
+        ]
+        adjust_unread(unread_deltas([(notification.user_id, False) for notification in created], 1), session)
+        return created
+    return []
+
+
+def publish_notifications(notifications: Iterable[NotificationRead]):
+    for notification in notifications:
+        notification_broker.publish(notification.user_id, notification.model_dump(mode = "json"))
+
+
+def commit_budget_changes(keys: Iterable[BudgetKey], session: Session):
+    if BUDGET_NOTIFICATIONS == "inline":
+        created = evaluate_budgets(keys, session)
+        session.commit()
+        publish_notifications(created)
+        return
     session.commit()
+    budget_evaluator.mark(keys)
+
+
+def budget_entry(transaction: Transactions) -> Optional[BudgetEntry]:
+    if not reference_data.get().is_expense(transaction.transaction_type_id):
+        return None
+    return transaction.category_id, transaction.amount, transaction.date
+
+
+def apply_spent_delta(
+    user_id: int,
+    session: Session,
+    old: Optional[BudgetEntry] = None,
+    new: Optional[BudgetEntry] = None
+):
+    entries = [(entry, sign) for entry, sign in ((old, -1), (new, 1)) if entry is not None]
+    if not entries:
+        session.commit()
+        return
+
+    matches = [
+        and_(Budgets.category_id == category_id, Budgets.start_date <= date, Budgets.end_date >= date)
+        for (category_id, _, date), _ in entries
+    ]
+    delta = sum(
+        (case((match, sign * amount), else_ = ZERO) for match, ((_, amount, _), sign) in zip(matches, entries)),
+        ZERO
+    )
+    session.exec(
+        update(Budgets)
+        .where(Budgets.user_id == user_id, or_(*matches))
+        .values(total_spent = Budgets.total_spent + delta)
+        .execution_options(synchronize_session = "fetch")
+    )
+
+    commit_budget_changes({(user_id, category_id) for (category_id, _, _), _ in entries}, session)
+
+
+def record_transaction_change(
+    user_id: int,
+    session: Session,
+    old: Optional[BudgetEntry] = None,
+    new: Optional[BudgetEntry] = None
+):
+    if BUDGET_ACCOUNTING == "incremental":
+        apply_spent_delta(user_id, session, old = old, new = new)
+        return
+
+    session.commit()
+    category_ids = {entry[0] for entry in (old, new) if entry is not None}
+    for category_id in category_ids:
+        update_total_spent(category_id = category_id, user_id = user_id, session = session)
+
+
+def spent_total_subquery():
+    expense_type_id = reference_data.get().expense_type_id
+    if expense_type_id is None:
+        return None
+
+    return (
+        select(func.coalesce(func.sum(Transactions.amount), ZERO))
+        .where(
+            Transactions.user_id == Budgets.user_id,
+            Transactions.category_id == Budgets.category_id,
+            Transactions.transaction_type_id == expense_type_id,
+            Transactions.date.between(Budgets.start_date, Budgets.end_date)
+        )
+        .scalar_subquery()
+    )
+
+
+def recompute_total_spent(user_id: int, category_ids: Iterable[int], session: Session):
+    category_ids = list(category_ids)
+    total = spent_total_subquery()
+    if not category_ids or total is None:
+        return
+
+    session.exec(
+        update(Budgets)
+        .where(Budgets.user_id == user_id, Budgets.category_id.in_(category_ids))
+        .values(total_spent = total)
+        .execution_options(synchronize_session = "fetch")
+    )
+
+
+def commit_recomputed_totals(user_id: int, category_ids: Iterable[int], session: Session):
+    category_ids = set(category_ids)
+    recompute_total_spent(user_id, category_ids, session)
+    commit_budget_changes({(user_id, category_id) for category_id in category_ids}, session)
+
+
+def reconcile_total_spent(session: Session) -> int:
+    total = spent_total_subquery()
+    if total is None:
+        return 0
+
+    result = session.exec(
+        update(Budgets)
+        .where(Budgets.total_spent.is_distinct_from(total))
+        .values(total_spent = total)
+        .returning(Budgets.user_id, Budgets.category_id)
+        .execution_options(synchronize_session = False)
+    )
+    drifted = result.all()
+
+    commit_budget_changes({(user_id, category_id) for user_id, category_id in drifted}, session)
+    return len(drifted)
+
+
+class BudgetEvaluator:
+    def __init__(self, batch_size: int, delay: float, retry_interval: float):
+        self.batch_size = batch_size
+        self.delay = delay
+        self.retry_interval = retry_interval
+        self.dirty: Set[BudgetKey] = set()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.stopped = False
+
+    def mark(self, keys: Iterable[BudgetKey]):
+        with self.condition:
+            self.dirty.update(keys)
+            if self.thread is None:
+                self.stopped = False
+                self.thread = threading.Thread(target = self.run, name = "budget-evaluator", daemon = True)
+                self.thread.start()
+            self.condition.notify()
+
+    def take(self) -> Optional[List[BudgetKey]]:
+        with self.condition:
+            while not self.dirty and not self.stopped:
+                self.condition.wait()
+            deadline = time.monotonic() + self.delay
+            while len(self.dirty) < self.batch_size and not self.stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            if not self.dirty:
+                return None
+            return [self.dirty.pop() for _ in range(min(self.batch_size, len(self.dirty)))]
+
+    def run(self):
+        while True:
+            batch = self.take()
+            if batch is None:
+                return
+            try:
+                with Session(engine) as session:
+                    created = evaluate_budgets(batch, session)
+                    session.commit()
+            except Exception:
+                logger.exception("Budget evaluation failed for %d keys", len(batch))
+                with self.condition:
+                    if self.stopped:
+                        return
+                    self.dirty.update(batch)
+                    self.condition.wait(self.retry_interval)
+                continue
+            publish_notifications(created)
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            thread.join()
+
+
+budget_evaluator = BudgetEvaluator(BUDGET_EVALUATION_BATCH, BUDGET_EVALUATION_DELAY, BUDGET_EVALUATION_RETRY)
+
+
+def acquire_reconcile_lock(session: Session) -> bool:
+    if session.get_bind().dialect.name != "postgresql":
+        return True
+    return session.exec(select(func.pg_try_advisory_xact_lock(RECONCILE_LOCK_KEY))).one()
+
+
+def start_reconciliation(interval: int = BUDGET_RECONCILE_INTERVAL) -> threading.Event:
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                with Session(engine) as session:
+                    if acquire_reconcile_lock(session):
+                        reconcile_total_spent(session)
+            except Exception:
+                logger.exception("Budget reconciliation failed")
+
+    threading.Thread(target = run, name = "budget-reconciliation", daemon = True).start()
+    return stop
 
 
 @router.patch("/{budget_id}", response_model = BudgetRead)
@@ -137,8 +413,9 @@ def update_budget(
 
     data = budget_update.dict(exclude_unset = True)
     if 'category_id' in data:
-        category = session.get(Categories, data['category_id'])
-        if not category or category.transaction_type.name != TransactionTypeEnums.expense:
+        snapshot = reference_data.get()
+        category = snapshot.categories.get(data['category_id'])
+        if not category or not snapshot.is_expense(category.transaction_type_id):
             raise HTTPException(status_code = 400, detail = "Invalid expense category")
     for k, v in data.items():
         setattr(budget, k, v)
@@ -1,7 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from connection import get_session
-from models import Categories
+from fastapi import APIRouter, HTTPException, Request, Response
+from reference_data import not_modified, reference_data
 from schemas import CategoryRead
 from typing import List
 
@@ -9,19 +7,21 @@ router = APIRouter(prefix = "/categories", tags = ["Categories"])
 
 
 @router.get("/", response_model = List[CategoryRead])
-def read_categories(
-    session: Session = Depends(get_session)
-):
-    categories = session.exec(select(Categories)).all()
-    return categories
+async def read_categories(request: Request, response: Response):
+    snapshot = reference_data.get()
+    cached = not_modified(request, response, snapshot.version)
+    if cached:
+        return cached
+    return list(snapshot.categories.values())
 
 
 @router.get("/{category_id}", response_model = CategoryRead)
-def read_category(
-    category_id: int,
-    session: Session = Depends(get_session)
-):
-    category = session.get(Categories, category_id)
+async def read_category(category_id: int, request: Request, response: Response):
+    snapshot = reference_data.get()
+    category = snapshot.categories.get(category_id)
     if not category:
         raise HTTPException(status_code = 404, detail = "Category not found")
+    cached = not_modified(request, response, snapshot.version)
+    if cached:
+        return cached
     return category
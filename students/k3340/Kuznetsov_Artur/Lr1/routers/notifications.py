@@ -1,25 +1,130 @@
-from fastapi import APIRouter, Depends, HTTPException
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_, update
 from sqlmodel import Session, select
-from connection import get_session
-from models import Notifications, Users
-from schemas import NotificationRead
+from connection import dialect_insert, get_session
+from events import notification_events
+from models import NotificationCounters, Notifications, Users
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from schemas import MarkReadResult, NotificationMarkRead, NotificationPage, NotificationRead, UnreadCount
+from serialization import RowSerializer, read_columns
 from routers.auth import get_current_user
-from typing import List
+from typing import Dict, Optional
 
 router = APIRouter(prefix = "/notifications", tags = ["Notifications"])
 
+NOTIFICATION_COLUMNS = read_columns(Notifications, NotificationRead)
+notification_page_serializer = RowSerializer(NotificationPage)
 
-@router.get("/", response_model = List[NotificationRead])
+
+def adjust_unread(deltas: Dict[int, int], session: Session):
+    rows = [{"user_id": user_id, "unread": delta} for user_id, delta in deltas.items() if delta]
+    if not rows:
+        return
+    statement = dialect_insert(NotificationCounters, session).values(rows)
+    session.exec(statement.on_conflict_do_update(
+        index_elements = ["user_id"],
+        set_ = {"unread": NotificationCounters.unread + statement.excluded.unread}
+    ))
+
+
+def unread_deltas(rows, sign: int) -> Counter:
+    deltas = Counter()
+    for user_id, is_read in rows:
+        if not is_read:
+            deltas[user_id] += sign
+    return deltas
+
+
+def notifications_page_statement(user_id: int, unread_only: bool, cursor: Optional[str], limit: int):
+    statement = select(*NOTIFICATION_COLUMNS).where(Notifications.user_id == user_id)
+    if unread_only:
+        statement = statement.where(Notifications.is_read == False)
+    if cursor is not None:
+        statement = statement.where(
+            tuple_(Notifications.created_at, Notifications.notification_id) < decode_cursor(cursor)
+        )
+    return (
+        statement
+        .order_by(Notifications.created_at.desc(), Notifications.notification_id.desc())
+        .limit(limit + 1)
+    )
+
+
+def notifications_page(rows: list, limit: int) -> Response:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.notification_id)
+    return notification_page_serializer.response({
+        "items": [dict(row._mapping) for row in rows],
+        "next_cursor": next_cursor
+    })
+
+
+def unread_count_statement(user_id: int):
+    return select(NotificationCounters.unread).where(NotificationCounters.user_id == user_id)
+
+
+@router.get("/", response_model = NotificationPage)
 def read_notifications(
     unread_only: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge = 1, le = MAX_PAGE_SIZE),
     current_user: Users = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    statement = select(Notifications).where(Notifications.user_id == current_user.user_id)
-    if unread_only:
-        statement = statement.where(Notifications.is_read == False)
-    notifications = session.exec(statement).all()
-    return notifications
+    statement = notifications_page_statement(current_user.user_id, unread_only, cursor, limit)
+    return notifications_page(session.exec(statement).all(), limit)
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    current_user: Users = Depends(get_current_user)
+):
+    return StreamingResponse(
+        notification_events(request, current_user.user_id),
+        media_type = "text/event-stream",
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/unread-count", response_model = UnreadCount)
+def read_unread_count(
+    current_user: Users = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    unread = session.exec(unread_count_statement(current_user.user_id)).first()
+    return {"unread": unread or 0}
+
+
+@router.patch("/mark-read", response_model = MarkReadResult)
+def mark_notifications_read(
+    mark_read: NotificationMarkRead,
+    current_user: Users = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    statement = update(Notifications).where(
+        Notifications.user_id == current_user.user_id,
+        Notifications.is_read == False
+    )
+    if mark_read.ids is not None:
+        statement = statement.where(Notifications.notification_id.in_(mark_read.ids))
+    if mark_read.before is not None:
+        statement = statement.where(Notifications.created_at < mark_read.before)
+    updated = session.exec(
+        statement
+        .values(is_read = True)
+        .returning(Notifications.notification_id)
+        .execution_options(synchronize_session = False)
+    ).all()
+
+    adjust_unread({current_user.user_id: -len(updated)}, session)
+    session.commit()
+    return {"updated": len(updated)}
 
 
 @router.get("/{notification_id}", response_model = NotificationRead)
@@ -47,8 +152,10 @@ def mark_notification_read(
         raise HTTPException(status_code = 404, detail = "Notification not found")
     if notification.user_id != current_user.user_id:
         raise HTTPException(status_code = 403, detail = "Not authorized to update this notification")
-    notification.is_read = True
-    session.add(notification)
+    if not notification.is_read:
+        notification.is_read = True
+        session.add(notification)
+        adjust_unread({notification.user_id: -1}, session)
     session.commit()
     session.refresh(notification)
     return notification
@@ -0,0 +1,310 @@
+import numpy as np
+from collections import defaultdict
+from itertools import chain
+from datetime import datetime
+from decimal import Decimal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Integer, cast, delete, extract, func, insert
+from sqlmodel import Session, select
+from connection import dialect_insert, get_session
+from models import TagRollups, TransactionRollups, TransactionTags, Transactions, Users
+from money import ZERO, from_minor, minor_units
+from schemas import SummaryGroup, SummaryRow
+from routers.auth import get_current_user
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+router = APIRouter(prefix = "/reports", tags = ["Reports"])
+
+SUMMARY_KEYS = {
+    SummaryGroup.category: "category_id",
+    SummaryGroup.month: "month",
+    SummaryGroup.tag: "tag_id",
+}
+
+# (month, category_id, transaction_type_id, amount, tag_ids) of a transaction
+RollupEntry = Tuple[datetime, int, int, Decimal, Sequence[int]]
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def is_month_start(moment: Optional[datetime]) -> bool:
+    return moment is None or moment == month_start(moment)
+
+
+def month_start_expression(column, dialect_name: str):
+    if dialect_name == "postgresql":
+        return func.date_trunc("month", column)
+    return func.strftime("%Y-%m-01 00:00:00.000000", column)
+
+
+def rollup_entry(transaction: Transactions, tag_ids: Iterable[int]) -> RollupEntry:
+    return (
+        month_start(transaction.date),
+        transaction.category_id,
+        transaction.transaction_type_id,
+        transaction.amount,
+        tuple(tag_ids)
+    )
+
+
+def get_tag_ids(transaction_id: int, session: Session) -> List[int]:
+    return session.exec(
+        select(TransactionTags.tag_id).where(TransactionTags.transaction_id == transaction_id)
+    ).all()
+
+
+def get_tag_ids_by_transaction(transaction_ids: Iterable[int], session: Session) -> Dict[int, List[int]]:
+    tag_ids = defaultdict(list)
+    for transaction_id, tag_id in session.exec(
+        select(TransactionTags.transaction_id, TransactionTags.tag_id)
+        .where(TransactionTags.transaction_id.in_(list(transaction_ids)))
+    ).all():
+        tag_ids[transaction_id].append(tag_id)
+    return tag_ids
+
+
+def upsert_rollups(model, key_columns: List[str], rows: List[dict], session: Session):
+    if not rows:
+        return
+    statement = dialect_insert(model, session).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements = key_columns,
+        set_ = {
+            "total": model.total + statement.excluded.total,
+            "count": model.count + statement.excluded.count,
+        }
+    )
+    session.exec(statement)
+
+
+def update_rollups(
+    user_id: int,
+    session: Session,
+    added: Iterable[RollupEntry] = (),
+    removed: Iterable[RollupEntry] = ()
+):
+    categories = defaultdict(lambda: [ZERO, 0])
+    tags = defaultdict(lambda: [ZERO, 0])
+    for entries, sign in ((added, 1), (removed, -1)):
+        for month, category_id, transaction_type_id, amount, tag_ids in entries:
+            category_totals = categories[(month, category_id, transaction_type_id)]
+            category_totals[0] += sign * amount
+            category_totals[1] += sign
+            for tag_id in tag_ids:
+                tag_totals = tags[(month, tag_id, transaction_type_id)]
+                tag_totals[0] += sign * amount
+                tag_totals[1] += sign
+
+    upsert_rollups(
+        TransactionRollups,
+        ["user_id", "month", "category_id", "transaction_type_id"],
+        [
+            {
+                "user_id": user_id,
+                "month": month,
+                "category_id": category_id,
+                "transaction_type_id": transaction_type_id,
+                "total": total,
+                "count": count,
+            }
+            for (month, category_id, transaction_type_id), (total, count) in categories.items()
+            if count or total
+        ],
+        session
+    )
+    upsert_rollups(
+        TagRollups,
+        ["user_id", "month", "tag_id", "transaction_type_id"],
+        [
+            {
+                "user_id": user_id,
+                "month": month,
+                "tag_id": tag_id,
+                "transaction_type_id": transaction_type_id,
+                "total": total,
+                "count": count,
+            }
+            for (month, tag_id, transaction_type_id), (total, count) in tags.items()
+            if count or total
+        ],
+        session
+    )
+
+    if any(count < 0 for _, count in categories.values()):
+        session.exec(delete(TransactionRollups).where(
+            TransactionRollups.user_id == user_id,
+            TransactionRollups.count <= 0
+        ))
+    if any(count < 0 for _, count in tags.values()):
+        session.exec(delete(TagRollups).where(TagRollups.user_id == user_id, TagRollups.count <= 0))
+
+
+def rebuild_rollups(session: Session, user_id: Optional[int] = None):
+    month = month_start_expression(Transactions.date, session.get_bind().dialect.name)
+
+    delete_categories = delete(TransactionRollups)
+    delete_tags = delete(TagRollups)
+    category_source = select(
+        Transactions.user_id,
+        month,
+        Transactions.category_id,
+        Transactions.transaction_type_id,
+        func.sum(Transactions.amount),
+        func.count()
+    )
+    tag_source = select(
+        Transactions.user_id,
+        month,
+        TransactionTags.tag_id,
+        Transactions.transaction_type_id,
+        func.sum(Transactions.amount),
+        func.count()
+    ).join(TransactionTags, TransactionTags.transaction_id == Transactions.transaction_id)
+    if user_id is not None:
+        delete_categories = delete_categories.where(TransactionRollups.user_id == user_id)
+        delete_tags = delete_tags.where(TagRollups.user_id == user_id)
+        category_source = category_source.where(Transactions.user_id == user_id)
+        tag_source = tag_source.where(Transactions.user_id == user_id)
+
+    session.exec(delete_categories)
+    session.exec(delete_tags)
+    session.exec(
+        insert(TransactionRollups).from_select(
+            ["user_id", "month", "category_id", "transaction_type_id", "total", "count"],
+            category_source.group_by(
+                Transactions.user_id, month, Transactions.category_id, Transactions.transaction_type_id
+            )
+        )
+    )
+    session.exec(
+        insert(TagRollups).from_select(
+            ["user_id", "month", "tag_id", "transaction_type_id", "total", "count"],
+            tag_source.group_by(
+                Transactions.user_id, month, TransactionTags.tag_id, Transactions.transaction_type_id
+            )
+        )
+    )
+    session.commit()
+
+
+def summary_statement(
+    user_id: int,
+    group_by: SummaryGroup,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime]
+):
+    if group_by == SummaryGroup.tag:
+        model, key = TagRollups, TagRollups.tag_id
+    elif group_by == SummaryGroup.month:
+        model, key = TransactionRollups, TransactionRollups.month
+    else:
+        model, key = TransactionRollups, TransactionRollups.category_id
+
+    statement = (
+        select(key, model.transaction_type_id, func.sum(model.total), func.sum(model.count))
+        .where(model.user_id == user_id)
+        .group_by(key, model.transaction_type_id)
+        .order_by(key, model.transaction_type_id)
+    )
+    if date_from is not None:
+        statement = statement.where(model.month >= month_start(date_from))
+    if date_to is not None:
+        statement = statement.where(model.month < month_start(date_to))
+    return statement
+
+
+def summary_rows(rows, group_by: SummaryGroup) -> List[dict]:
+    return [
+        {
+            SUMMARY_KEYS[group_by]: key,
+            "transaction_type_id": transaction_type_id,
+            "total": total,
+            "count": count,
+        }
+        for key, transaction_type_id, total, count in rows
+    ]
+
+
+def merge_summaries(rows: List[dict], extra: List[dict], group_by: SummaryGroup) -> List[dict]:
+    key_name = SUMMARY_KEYS[group_by]
+    merged = {(row[key_name], row["transaction_type_id"]): dict(row) for row in rows}
+    for row in extra:
+        key = (row[key_name], row["transaction_type_id"])
+        if key in merged:
+            merged[key]["total"] += row["total"]
+            merged[key]["count"] += row["count"]
+        else:
+            merged[key] = dict(row)
+    return [merged[key] for key in sorted(merged)]
+
+
+def range_statement(
+    user_id: int,
+    group_by: SummaryGroup,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime]
+):
+    if group_by == SummaryGroup.tag:
+        key = TransactionTags.tag_id
+    elif group_by == SummaryGroup.month:
+        key = cast(extract("year", Transactions.date) * 12 + extract("month", Transactions.date) - 1, Integer)
+    else:
+        key = Transactions.category_id
+
+    statement = (
+        select(key, Transactions.transaction_type_id, minor_units(Transactions.amount))
+        .where(Transactions.user_id == user_id)
+    )
+    if group_by == SummaryGroup.tag:
+        statement = statement.join(TransactionTags, TransactionTags.transaction_id == Transactions.transaction_id)
+    if date_from is not None:
+        statement = statement.where(Transactions.date >= date_from)
+    if date_to is not None:
+        statement = statement.where(Transactions.date <= date_to)
+    return statement
+
+
+def aggregate_range(rows: Sequence[Tuple[int, int, int]], group_by: SummaryGroup) -> List[dict]:
+    if not rows:
+        return []
+    values = np.fromiter(chain.from_iterable(rows), dtype = np.int64, count = 3 * len(rows)).reshape(-1, 3)
+    keys, type_ids, amounts = values.T
+
+    slots = int(type_ids.max()) + 1
+    groups, inverse = np.unique(keys * slots + type_ids, return_inverse = True)
+    totals = np.zeros(len(groups), dtype = np.int64)
+    np.add.at(totals, inverse, amounts)
+    counts = np.bincount(inverse, minlength = len(groups))
+
+    group_keys = (groups // slots).tolist()
+    if group_by == SummaryGroup.month:
+        group_keys = [datetime(key // 12, key % 12 + 1, 1) for key in group_keys]
+    return [
+        {
+            SUMMARY_KEYS[group_by]: key,
+            "transaction_type_id": type_id,
+            "total": from_minor(total),
+            "count": count,
+        }
+        for key, type_id, total, count in zip(group_keys, (groups % slots).tolist(), totals.tolist(), counts.tolist())
+    ]
+
+
+@router.get("/summary", response_model = List[SummaryRow])
+def read_summary(
+    date_from: Optional[datetime] = Query(None, alias = "from"),
+    date_to: Optional[datetime] = Query(None, alias = "to"),
+    group_by: SummaryGroup = SummaryGroup.category,
+    current_user: Users = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    if is_month_start(date_from) and is_month_start(date_to):
+        rows = session.exec(summary_statement(current_user.user_id, group_by, date_from, date_to)).all()
+        if date_to is None or (date_from is not None and date_from > date_to):
+            return summary_rows(rows, group_by)
+        boundary = session.exec(range_statement(current_user.user_id, group_by, date_to, date_to)).all()
+        return merge_summaries(summary_rows(rows, group_by), aggregate_range(boundary, group_by), group_by)
+    rows = session.exec(range_statement(current_user.user_id, group_by, date_from, date_to)).all()
+    return aggregate_range(rows, group_by)
@@ -1,7 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from connection import get_session
-from models import Tags
+from fastapi import APIRouter, HTTPException, Request, Response
+from reference_data import not_modified, reference_data
 from schemas import TagRead
 from typing import List
 
@@ -9,19 +7,21 @@ router = APIRouter(prefix = "/tags", tags = ["Tags"])
 
 
 @router.get("/", response_model = List[TagRead])
-def read_tags(
-    session: Session = Depends(get_session)
-):
-    tags = session.exec(select(Tags)).all()
-    return tags
+async def read_tags(request: Request, response: Response):
+    snapshot = reference_data.get()
+    cached = not_modified(request, response, snapshot.version)
+    if cached:
+        return cached
+    return list(snapshot.tags.values())
 
 
 @router.get("/{tag_id}", response_model = TagRead)
-def read_tag(
-    tag_id: int,
-    session: Session = Depends(get_session)
-):
-    tag = session.get(Tags, tag_id)
+async def read_tag(tag_id: int, request: Request, response: Response):
+    snapshot = reference_data.get()
+    tag = snapshot.tags.get(tag_id)
     if not tag:
         raise HTTPException(status_code = 404, detail = "Tag not found")
+    cached = not_modified(request, response, snapshot.version)
+    if cached:
+        return cached
     return tag
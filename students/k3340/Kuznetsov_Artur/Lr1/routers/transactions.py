@@ -1,15 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import delete
+import codecs
+import csv
+import io
+import json
+from collections import deque
+from datetime import datetime
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import delete, insert, tuple_
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
-from connection import get_session
-from models import Categories, Tags, TransactionTags, TransactionTypeEnums, TransactionTypes, Transactions, Users
-from routers.budgets import update_total_spent
-from schemas import TransactionCreate, TransactionRead, TransactionTagRead, TransactionUpdate
+from connection import engine, get_session
+from models import Tags, TransactionTags, Transactions, Users
+from reference_data import ReferenceSnapshot, reference_data
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from routers.budgets import budget_entry, commit_recomputed_totals, record_transaction_change
+from routers.reports import get_tag_ids, get_tag_ids_by_transaction, month_start, rollup_entry, update_rollups
+from schemas import (
+    BulkImportResult, ExportFormat, TransactionBatchDelete, TransactionBatchDeleteResult, TransactionBatchUpdate,
+    TransactionCreate, TransactionExportRow, TransactionFilters, TransactionPage, TransactionRead, TransactionTagRead,
+    TransactionUpdate
+)
+from serialization import RowSerializer, read_columns
 from routers.auth import get_current_user
-from typing import List
+from typing import Dict, List, Optional
 
 router = APIRouter(prefix = "/transactions", tags = ["Transactions"])
 
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+TRANSACTION_COLUMNS = read_columns(Transactions, TransactionRead, exclude = {"tags"})
+EXPORT_FIELDS = list(TransactionExportRow.model_fields)
+EXPORT_MEDIA_TYPES = {ExportFormat.csv: "text/csv", ExportFormat.ndjson: "application/x-ndjson"}
+BULK_IMPORT_OPENAPI = {
+    "requestBody": {
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/TransactionCreate"}}},
+            "text/csv": {"schema": {"type": "string"}},
+            "application/x-ndjson": {"schema": {"type": "string"}},
+        }
+    }
+}
+transaction_page_serializer = RowSerializer(TransactionPage)
+export_row_adapter = RowSerializer(TransactionExportRow).adapter
+
+
+def transaction_with_tags_statement(transaction_id: int):
+    return (
+        select(Transactions)
+        .where(Transactions.transaction_id == transaction_id)
+        .options(selectinload(Transactions.tags))
+    )
+
+
+def get_transaction_with_tags(transaction_id: int, session: Session) -> Optional[Transactions]:
+    return session.exec(transaction_with_tags_statement(transaction_id)).first()
+
 
 @router.post("/", response_model = TransactionRead)
 def create_transaction(
@@ -17,14 +67,17 @@ def create_transaction(
     current_user: Users = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    transaction_type = session.get(TransactionTypes, transaction.transaction_type_id)
-    category = session.get(Categories, transaction.category_id)
-    if not transaction_type:
+    snapshot = reference_data.get()
+    category = snapshot.categories.get(transaction.category_id)
+    if transaction.transaction_type_id not in snapshot.transaction_types:
         raise HTTPException(status_code = 404, detail = "Transaction type not found")
     if not category:
         raise HTTPException(status_code = 404, detail = "Category not found")
     if category.transaction_type_id != transaction.transaction_type_id:
         raise HTTPException(status_code = 400, detail = "Category does not match transaction type")
+    for tag_id in transaction.tag_ids or []:
+        if tag_id not in snapshot.tags:
+            raise HTTPException(status_code = 404, detail = f"Tag {tag_id} not found")
 
     db_transaction = Transactions(
         user_id = current_user.user_id,
@@ -35,24 +88,305 @@ def create_transaction(
         description = transaction.description
     )
     session.add(db_transaction)
-    session.commit()
-    session.refresh(db_transaction)
+    session.flush()
 
     for tag_id in transaction.tag_ids or []:
-        tag = session.get(Tags, tag_id)
-        if not tag:
-            raise HTTPException(status_code = 404, detail = f"Tag {tag_id} not found")
         session.add(TransactionTags(tag_id = tag_id, transaction_id = db_transaction.transaction_id))
-    session.commit()
 
-    if transaction_type.name == TransactionTypeEnums.expense:
-        update_total_spent(
-            category_id = transaction.category_id,
-            user_id = current_user.user_id,
-            session = session
+    update_rollups(
+        current_user.user_id,
+        session,
+        added = [rollup_entry(db_transaction, transaction.tag_ids or [])]
+    )
+    record_transaction_change(
+        user_id = current_user.user_id,
+        session = session,
+        new = budget_entry(db_transaction)
+    )
+
+    return get_transaction_with_tags(db_transaction.transaction_id, session)
+
+
+class TransactionImporter:
+    def __init__(self, user_id: int, session: Session):
+        self.user_id = user_id
+        self.session = session
+        self.reference = reference_data.get()
+        self.pending: List[TransactionCreate] = []
+        self.expense_categories = set()
+        self.imported = 0
+
+    def add(self, rows: List[TransactionCreate]):
+        for row in rows:
+            self.validate(row, self.imported + len(self.pending) + 1)
+            self.pending.append(row)
+            if len(self.pending) >= IMPORT_CHUNK_SIZE:
+                self.flush()
+
+    def validate(self, row: TransactionCreate, row_number: int):
+        category = self.reference.categories.get(row.category_id)
+        if row.transaction_type_id not in self.reference.transaction_types:
+            raise HTTPException(status_code = 404, detail = f"Row {row_number}: transaction type not found")
+        if not category:
+            raise HTTPException(status_code = 404, detail = f"Row {row_number}: category not found")
+        if category.transaction_type_id != row.transaction_type_id:
+            raise HTTPException(status_code = 400, detail = f"Row {row_number}: category does not match transaction type")
+        for tag_id in row.tag_ids or []:
+            if tag_id not in self.reference.tags:
+                raise HTTPException(status_code = 404, detail = f"Row {row_number}: tag {tag_id} not found")
+
+    def flush(self):
+        if not self.pending:
+            return
+        transaction_ids = self.session.exec(
+            insert(Transactions).returning(Transactions.transaction_id, sort_by_parameter_order = True),
+            params = [
+                {
+                    "user_id": self.user_id,
+                    "transaction_type_id": row.transaction_type_id,
+                    "category_id": row.category_id,
+                    "amount": row.amount,
+                    "date": row.date,
+                    "description": row.description,
+                }
+                for row in self.pending
+            ]
+        ).scalars().all()
+
+        created_at = datetime.utcnow()
+        links = [
+            {"tag_id": tag_id, "transaction_id": transaction_id, "created_at": created_at}
+            for row, transaction_id in zip(self.pending, transaction_ids)
+            for tag_id in row.tag_ids or []
+        ]
+        if links:
+            self.session.exec(insert(TransactionTags), params = links)
+
+        update_rollups(
+            self.user_id,
+            self.session,
+            added = [
+                (month_start(row.date), row.category_id, row.transaction_type_id, row.amount, row.tag_ids or [])
+                for row in self.pending
+            ]
         )
+        for row in self.pending:
+            if self.reference.is_expense(row.transaction_type_id):
+                self.expense_categories.add(row.category_id)
+        self.imported += len(self.pending)
+        self.pending = []
+
+    def finish(self) -> int:
+        self.flush()
+        commit_recomputed_totals(self.user_id, self.expense_categories, self.session)
+        return self.imported
+
+
+class TransactionExporter:
+    def __init__(self, export_format: ExportFormat):
+        self.export_format = export_format
+        self.current = None
+        self.tag_names: List[str] = []
+
+    def header(self) -> bytes:
+        if self.export_format == ExportFormat.csv:
+            return self.csv_line(EXPORT_FIELDS)
+        return b""
+
+    def write(self, rows) -> bytes:
+        chunks = []
+        for row in rows:
+            if self.current is not None and row.transaction_id != self.current.transaction_id:
+                chunks.append(self.encode())
+                self.tag_names = []
+            self.current = row
+            if row.tag_name is not None:
+                self.tag_names.append(row.tag_name)
+        return b"".join(chunks)
+
+    def finish(self) -> bytes:
+        return self.encode() if self.current is not None else b""
+
+    def encode(self) -> bytes:
+        row = self.current
+        if self.export_format == ExportFormat.csv:
+            return self.csv_line([
+                row.transaction_id,
+                row.date.isoformat(),
+                row.amount,
+                row.transaction_type_id,
+                row.category_id,
+                row.description or "",
+                ";".join(self.tag_names),
+            ])
+        return export_row_adapter.dump_json({
+            "transaction_id": row.transaction_id,
+            "date": row.date,
+            "amount": row.amount,
+            "transaction_type_id": row.transaction_type_id,
+            "category_id": row.category_id,
+            "description": row.description,
+            "tags": self.tag_names,
+        }) + b"\n"
+
+    @staticmethod
+    def csv_line(values: list) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator = "\n").writerow(values)
+        return buffer.getvalue().encode()
+
+
+def export_statement(user_id: int, date_from: Optional[datetime], date_to: Optional[datetime]):
+    statement = (
+        select(*TRANSACTION_COLUMNS, Tags.name.label("tag_name"))
+        .outerjoin(TransactionTags, TransactionTags.transaction_id == Transactions.transaction_id)
+        .outerjoin(Tags, Tags.tag_id == TransactionTags.tag_id)
+        .where(Transactions.user_id == user_id)
+    )
+    if date_from is not None:
+        statement = statement.where(Transactions.date >= date_from)
+    if date_to is not None:
+        statement = statement.where(Transactions.date <= date_to)
+    return (
+        statement
+        .order_by(Transactions.date, Transactions.transaction_id, TransactionTags.tag_id)
+        .execution_options(yield_per = EXPORT_BATCH_SIZE)
+    )
 
-    return db_transaction
+
+def export_response(chunks, export_format: ExportFormat) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type = EXPORT_MEDIA_TYPES[export_format],
+        headers = {"Content-Disposition": f'attachment; filename="transactions.{export_format.value}"'}
+    )
+
+
+def parse_import_row(data, row_number: int) -> TransactionCreate:
+    try:
+        return TransactionCreate.model_validate(data)
+    except ValidationError as e:
+        raise HTTPException(status_code = 422, detail = f"Row {row_number}: {e.errors()[0]['msg']}")
+
+
+def parse_csv_row(header: List[str], values: List[str], row_number: int) -> TransactionCreate:
+    data = dict(zip(header, values))
+    tag_ids = data.pop("tag_ids", "") or ""
+    data["tag_ids"] = [tag_id for tag_id in tag_ids.replace(",", ";").split(";") if tag_id.strip()]
+    if not data.get("description"):
+        data["description"] = None
+    return parse_import_row(data, row_number)
+
+
+def parse_ndjson_row(line: str, row_number: int) -> TransactionCreate:
+    try:
+        data = json.loads(line)
+    except ValueError:
+        raise HTTPException(status_code = 422, detail = f"Row {row_number}: invalid JSON")
+    return parse_import_row(data, row_number)
+
+
+async def read_lines(request: Request):
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    try:
+        async for chunk in request.stream():
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield line + "\n"
+        buffer += decoder.decode(b"", final = True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code = 422, detail = "Request body is not valid UTF-8")
+    if buffer:
+        yield buffer
+
+
+async def read_csv_rows(request: Request):
+    lines = deque()
+    reader = csv.reader(iter(lines.popleft, None), strict = True)
+    quotes = 0
+    async for line in read_lines(request):
+        lines.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            while lines:
+                yield next(reader)
+            quotes = 0
+    lines.append(None)
+    for row in reader:
+        yield row
+
+
+@router.post("/bulk", response_model = BulkImportResult, openapi_extra = BULK_IMPORT_OPENAPI)
+async def bulk_create_transactions(
+    request: Request,
+    current_user: Users = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    importer = await run_in_threadpool(TransactionImporter, current_user.user_id, session)
+    imported = await import_transactions(request, importer, run_in_threadpool)
+    return {"imported": imported}
+
+
+async def import_transactions(request: Request, importer: TransactionImporter, run) -> int:
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+
+    if content_type == "application/json":
+        try:
+            rows = TypeAdapter(List[TransactionCreate]).validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code = 422, detail = e.errors(include_url = False, include_context = False))
+        for i in range(0, len(rows), IMPORT_CHUNK_SIZE):
+            await run(importer.add, rows[i:i + IMPORT_CHUNK_SIZE])
+    elif content_type in CSV_CONTENT_TYPES | NDJSON_CONTENT_TYPES:
+        header = None
+        batch = []
+        row_number = 0
+        rows = read_csv_rows(request) if content_type in CSV_CONTENT_TYPES else read_lines(request)
+        try:
+            async for row in rows:
+                if content_type in CSV_CONTENT_TYPES:
+                    if not row:
+                        continue
+                    if header is None:
+                        header = [column.strip() for column in row]
+                        continue
+                    row_number += 1
+                    batch.append(parse_csv_row(header, row, row_number))
+                elif row.strip():
+                    row_number += 1
+                    batch.append(parse_ndjson_row(row, row_number))
+                if len(batch) >= IMPORT_CHUNK_SIZE:
+                    await run(importer.add, batch)
+                    batch = []
+        except csv.Error as e:
+            raise HTTPException(status_code = 422, detail = f"Row {row_number + 1}: {e}")
+        await run(importer.add, batch)
+    else:
+        raise HTTPException(status_code = 415, detail = f"Unsupported content type {content_type}")
+
+    return await run(importer.finish)
+
+
+@router.get("/export", response_class = StreamingResponse)
+def export_transactions(
+    export_format: ExportFormat = Query(ExportFormat.csv, alias = "format"),
+    date_from: Optional[datetime] = Query(None, alias = "from"),
+    date_to: Optional[datetime] = Query(None, alias = "to"),
+    current_user: Users = Depends(get_current_user)
+):
+    statement = export_statement(current_user.user_id, date_from, date_to)
+    exporter = TransactionExporter(export_format)
+
+    def chunks():
+        with Session(engine) as session:
+            yield exporter.header()
+            for rows in session.exec(statement).partitions():
+                yield exporter.write(rows)
+            yield exporter.finish()
+
+    return export_response(chunks(), export_format)
 
 
 @router.get("/tags", response_model = List[TransactionTagRead])
@@ -65,20 +399,226 @@ def read_transaction_tags(
     return tags_relations
 
 
-@router.get("/", response_model = List[TransactionRead])
-def read_transactions(current_user: Users = Depends(get_current_user), session: Session = Depends(get_session)):
-    statement = select(Transactions).where(Transactions.user_id == current_user.user_id)
-    transactions = session.exec(statement).all()
+def transaction_filters(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    category_id: Optional[int] = None,
+    transaction_type_id: Optional[int] = None,
+    tag_id: Optional[int] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None
+) -> TransactionFilters:
+    return TransactionFilters(
+        date_from = date_from,
+        date_to = date_to,
+        category_id = category_id,
+        transaction_type_id = transaction_type_id,
+        tag_id = tag_id,
+        min_amount = min_amount,
+        max_amount = max_amount
+    )
+
+
+def filter_transactions(statement, user_id: int, filters: TransactionFilters):
+    statement = statement.where(Transactions.user_id == user_id)
+    if filters.date_from is not None:
+        statement = statement.where(Transactions.date >= filters.date_from)
+    if filters.date_to is not None:
+        statement = statement.where(Transactions.date <= filters.date_to)
+    if filters.category_id is not None:
+        statement = statement.where(Transactions.category_id == filters.category_id)
+    if filters.transaction_type_id is not None:
+        statement = statement.where(Transactions.transaction_type_id == filters.transaction_type_id)
+    if filters.tag_id is not None:
+        statement = statement.where(
+            Transactions.transaction_id.in_(
+                select(TransactionTags.transaction_id).where(TransactionTags.tag_id == filters.tag_id)
+            )
+        )
+    if filters.min_amount is not None:
+        statement = statement.where(Transactions.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        statement = statement.where(Transactions.amount <= filters.max_amount)
+    return statement
+
+
+def transactions_page_statement(user_id: int, filters: TransactionFilters, cursor: Optional[str], limit: int):
+    statement = filter_transactions(select(*TRANSACTION_COLUMNS), user_id, filters)
+    if cursor is not None:
+        statement = statement.where(tuple_(Transactions.date, Transactions.transaction_id) < decode_cursor(cursor))
+    return (
+        statement
+        .order_by(Transactions.date.desc(), Transactions.transaction_id.desc())
+        .limit(limit + 1)
+    )
+
+
+def transactions_page(rows: list, limit: int) -> dict:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.date, last.transaction_id)
+    return {"items": [dict(row._mapping, tags = []) for row in rows], "next_cursor": next_cursor}
+
+
+def page_tags_statement(page: dict):
+    return (
+        select(TransactionTags.transaction_id, Tags.name, Tags.tag_id)
+        .join(Tags, Tags.tag_id == TransactionTags.tag_id)
+        .where(TransactionTags.transaction_id.in_([item["transaction_id"] for item in page["items"]]))
+        .order_by(TransactionTags.transaction_id, TransactionTags.tag_id)
+    )
+
+
+def transactions_page_response(page: dict, tag_rows: list) -> Response:
+    items = {item["transaction_id"]: item for item in page["items"]}
+    for transaction_id, name, tag_id in tag_rows:
+        items[transaction_id]["tags"].append({"name": name, "tag_id": tag_id})
+    return transaction_page_serializer.response(page)
+
+
+@router.get("/", response_model = TransactionPage)
+def read_transactions(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge = 1, le = MAX_PAGE_SIZE),
+    filters: TransactionFilters = Depends(transaction_filters),
+    current_user: Users = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    statement = transactions_page_statement(current_user.user_id, filters, cursor, limit)
+    page = transactions_page(session.exec(statement).all(), limit)
+    return transactions_page_response(page, session.exec(page_tags_statement(page)).all())
+
+
+def validate_transaction_changes(data: dict, snapshot: ReferenceSnapshot):
+    if 'transaction_type_id' in data:
+        if data['transaction_type_id'] not in snapshot.transaction_types:
+            raise HTTPException(status_code = 404, detail = "Type not found")
+    if 'category_id' in data:
+        cat = snapshot.categories.get(data['category_id'])
+        if not cat or (data.get('transaction_type_id') and cat.transaction_type_id != data['transaction_type_id']):
+            raise HTTPException(status_code = 400, detail = "Category/type mismatch")
+    for tag_id in data.get('tag_ids') or []:
+        if tag_id not in snapshot.tags:
+            raise HTTPException(status_code = 404, detail = f"Tag {tag_id} not found")
+
+
+def replace_tags(tag_ids: Dict[int, List[int]], session: Session):
+    session.exec(delete(TransactionTags).where(TransactionTags.transaction_id.in_(list(tag_ids))))
+    created_at = datetime.utcnow()
+    links = [
+        {"tag_id": tag_id, "transaction_id": transaction_id, "created_at": created_at}
+        for transaction_id, transaction_tag_ids in tag_ids.items()
+        for tag_id in transaction_tag_ids
+    ]
+    if links:
+        session.exec(insert(TransactionTags), params = links)
+
+
+def get_user_transactions(transaction_ids: List[int], user_id: int, session: Session) -> Dict[int, Transactions]:
+    transactions = {
+        transaction.transaction_id: transaction
+        for transaction in session.exec(
+            select(Transactions).where(Transactions.transaction_id.in_(transaction_ids))
+        ).all()
+    }
+    missing = [transaction_id for transaction_id in transaction_ids if transaction_id not in transactions]
+    if missing:
+        raise HTTPException(status_code = 404, detail = f"Transactions not found: {missing}")
+    if any(transaction.user_id != user_id for transaction in transactions.values()):
+        raise HTTPException(status_code = 403, detail = "Not authorized")
     return transactions
 
 
+@router.patch("/batch", response_model = List[TransactionRead])
+def update_transactions(
+    batch: TransactionBatchUpdate,
+    current_user: Users = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    transaction_ids = [item.transaction_id for item in batch.items]
+    transactions = get_user_transactions(transaction_ids, current_user.user_id, session)
+    old_tag_ids = get_tag_ids_by_transaction(transaction_ids, session)
+    snapshot = reference_data.get()
+
+    entries = []
+    added = []
+    removed = []
+    new_tag_ids = {}
+    for item in batch.items:
+        transaction = transactions[item.transaction_id]
+        data = item.model_dump(exclude_unset = True, exclude_none = True, exclude = {"transaction_id"})
+        validate_transaction_changes(data, snapshot)
+
+        entries.append(budget_entry(transaction))
+        removed.append(rollup_entry(transaction, old_tag_ids[transaction.transaction_id]))
+        for k, v in data.items():
+            if k != 'tag_ids':
+                setattr(transaction, k, v)
+        if item.tag_ids is not None:
+            new_tag_ids[transaction.transaction_id] = item.tag_ids
+        entries.append(budget_entry(transaction))
+        added.append(rollup_entry(
+            transaction,
+            new_tag_ids.get(transaction.transaction_id, old_tag_ids[transaction.transaction_id])
+        ))
+        session.add(transaction)
+
+    if new_tag_ids:
+        replace_tags(new_tag_ids, session)
+    update_rollups(current_user.user_id, session, added = added, removed = removed)
+    session.flush()
+    commit_recomputed_totals(
+        current_user.user_id,
+        {entry[0] for entry in entries if entry is not None},
+        session
+    )
+
+    updated = {
+        transaction.transaction_id: transaction
+        for transaction in session.exec(
+            select(Transactions)
+            .where(Transactions.transaction_id.in_(transaction_ids))
+            .options(selectinload(Transactions.tags))
+        ).all()
+    }
+    return [updated[transaction_id] for transaction_id in transaction_ids]
+
+
+@router.delete("/batch", response_model = TransactionBatchDeleteResult)
+def delete_transactions(
+    batch: TransactionBatchDelete,
+    current_user: Users = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    transaction_ids = list(dict.fromkeys(batch.ids))
+    transactions = get_user_transactions(transaction_ids, current_user.user_id, session)
+    tag_ids = get_tag_ids_by_transaction(transaction_ids, session)
+
+    update_rollups(
+        current_user.user_id,
+        session,
+        removed = [rollup_entry(transaction, tag_ids[transaction_id]) for transaction_id, transaction in transactions.items()]
+    )
+    entries = [budget_entry(transaction) for transaction in transactions.values()]
+    session.exec(delete(TransactionTags).where(TransactionTags.transaction_id.in_(transaction_ids)))
+    session.exec(delete(Transactions).where(Transactions.transaction_id.in_(transaction_ids)))
+    commit_recomputed_totals(
+        current_user.user_id,
+        {entry[0] for entry in entries if entry is not None},
+        session
+    )
+    return {"deleted": len(transaction_ids)}
+
+
 @router.get("/{transaction_id}", response_model = TransactionRead)
 def read_transaction(
     transaction_id: int,
     session: Session = Depends(get_session),
     current_user: Users = Depends(get_current_user)
 ):
-    transaction = session.get(Transactions, transaction_id)
+    transaction = get_transaction_with_tags(transaction_id, session)
     if not transaction:
         raise HTTPException(status_code = 404, detail = "Transaction not found")
     if transaction.user_id != current_user.user_id:
@@ -99,50 +639,36 @@ def update_transaction(
     if transactions.user_id != current_user.user_id:
         raise HTTPException(status_code = 403, detail = "Not authorized")
 
-    old_category = transactions.category_id
+    old_entry = budget_entry(transactions)
+    old_tag_ids = get_tag_ids(transaction_id, session)
+    old_rollup = rollup_entry(transactions, old_tag_ids)
     data = upd.dict(exclude_unset = True, exclude_none = True)
-
-    if 'transaction_type_id' in data:
-        tt = session.get(TransactionTypes, data['transaction_type_id'])
-        if not tt:
-            raise HTTPException(status_code = 404, detail = "Type not found")
-    if 'category_id' in data:
-        cat = session.get(Categories, data['category_id'])
-        if not cat or (data.get('transaction_type_id') and cat.transaction_type_id != data['transaction_type_id']):
-            raise HTTPException(status_code = 400, detail = "Category/type mismatch")
+    validate_transaction_changes(data, reference_data.get())
 
     for k, v in data.items():
         if k != 'tag_ids':
             setattr(transactions, k, v)
 
     if upd.tag_ids is not None:
-        session.exec(
-            delete(TransactionTags).where(TransactionTags.transaction_id == transaction_id)
-        )
-        for tag_id in upd.tag_ids:
-            tag = session.get(Tags, tag_id)
-            if not tag:
-                raise HTTPException(status_code = 404, detail = f"Tag {tag_id} not found")
-            session.add(TransactionTags(tag_id = tag_id, transaction_id = transaction_id))
+        replace_tags({transaction_id: upd.tag_ids}, session)
 
     session.add(transactions)
-    session.commit()
-    session.refresh(transactions)
-
-    if transactions.transaction_type.name == TransactionTypeEnums.expense:
-        update_total_spent(
-            category_id = transactions.category_id,
-            user_id = current_user.user_id,
-            session = session
-        )
-        if old_category != transactions.category_id:
-            update_total_spent(
-                category_id = old_category,
-                user_id = current_user.user_id,
-                session = session
-            )
 
-    return transactions
+    new_tag_ids = upd.tag_ids if upd.tag_ids is not None else old_tag_ids
+    update_rollups(
+        current_user.user_id,
+        session,
+        added = [rollup_entry(transactions, new_tag_ids)],
+        removed = [old_rollup]
+    )
+    record_transaction_change(
+        user_id = current_user.user_id,
+        session = session,
+        old = old_entry,
+        new = budget_entry(transactions)
+    )
+
+    return get_transaction_with_tags(transaction_id, session)
 
 
 @router.delete("/{transaction_id}")
@@ -157,17 +683,14 @@ def delete_transaction(
     if transaction.user_id != current_user.user_id:
         raise HTTPException(status_code = 403, detail = "Not authorized to delete this transaction")
 
-    category_id = transaction.category_id
-    transaction_type = session.get(TransactionTypes, transaction.transaction_type_id)
+    old_entry = budget_entry(transaction)
+    update_rollups(
+        current_user.user_id,
+        session,
+        removed = [rollup_entry(transaction, get_tag_ids(transaction_id, session))]
+    )
 
     session.delete(transaction)
-    session.commit()
-
-    if transaction_type.name == TransactionTypeEnums.expense:
-        update_total_spent(
-            category_id = category_id,
-            user_id = current_user.user_id,
-            session = session
-        )
+    record_transaction_change(user_id = current_user.user_id, session = session, old = old_entry)
 
     return {"message": "Transaction deleted successfully"}
@@ -1,23 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 from connection import get_session
 from models import Users
 from typing import List
-from routers.auth import create_user_and_token
+from routers.auth import create_user_and_token, invalidate_user
 from schemas import UserCreate, UserRead, UserUpdate, UserWithToken
+from serialization import RowSerializer, read_columns
 
 router = APIRouter(prefix = "/users", tags = ["Users"])
 
+USER_COLUMNS = read_columns(Users, UserRead)
+user_list_serializer = RowSerializer(List[UserRead])
+
 
 @router.post("/", response_model = UserWithToken)
-def create_user(user_create: UserCreate, session: Session = Depends(get_session)):
-    return create_user_and_token(user_create, session)
+async def create_user(user_create: UserCreate, session: Session = Depends(get_session)):
+    return await create_user_and_token(user_create, session)
+
+
+def users_response(rows: list) -> Response:
+    return user_list_serializer.response([dict(row._mapping) for row in rows])
 
 
 @router.get("/", response_model = List[UserRead])
 def read_users(session: Session = Depends(get_session)):
-    users = session.exec(select(Users)).all()
-    return users
+    return users_response(session.exec(select(*USER_COLUMNS)).all())
 
 
 @router.get("/{user_id}", response_model = UserRead)
@@ -39,6 +46,7 @@ def update_user(user_id: int, user_update: UserUpdate, session: Session = Depend
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_user(user.username)
     return user
 
 
@@ -49,4 +57,5 @@ def delete_user(user_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code = 404, detail = "User not found")
     session.delete(user)
     session.commit()
+    invalidate_user(user.username)
     return {"message": "User deleted successfully"}
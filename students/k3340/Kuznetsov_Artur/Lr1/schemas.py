@@ -1,9 +1,13 @@
-from pydantic import BaseModel, EmailStr, field_validator, validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator, validator
 from typing import Optional, List
 from datetime import datetime
+from decimal import Decimal
+from enum import Enum
 
 from pydantic_core.core_schema import ValidationInfo
 
+from money import Money
+
 
 class UserBase(BaseModel):
     username: str
@@ -46,7 +50,7 @@ class UserPassword(BaseModel):
 
 
 class TransactionBase(BaseModel):
-    amount: float
+    amount: Money
     date: datetime
     description: Optional[str] = None
 
@@ -57,26 +61,65 @@ class TransactionCreate(TransactionBase):
     tag_ids: Optional[List[int]] = []
 
     @field_validator('amount')
-    def amount_must_be_positive(cls, amount: float):
+    def amount_must_be_positive(cls, amount: Money):
         if amount <= 0:
             raise ValueError('Amount must be positive')
         return amount
 
+    @field_validator('tag_ids')
+    def tag_ids_must_be_unique(cls, tag_ids: Optional[List[int]]):
+        if tag_ids is None:
+            return tag_ids
+        return list(dict.fromkeys(tag_ids))
+
 
 class TransactionUpdate(BaseModel):
     transaction_type_id: Optional[int]
     category_id: Optional[int]
-    amount: Optional[float]
+    amount: Optional[Money]
     date: Optional[datetime]
     description: Optional[str] = None
     tag_ids: Optional[List[int]]
 
     @field_validator('amount')
-    def amount_must_be_positive(cls, amount: Optional[float]):
+    def amount_must_be_positive(cls, amount: Optional[Money]):
         if amount is not None and amount <= 0:
             raise ValueError('Amount must be positive')
         return amount
 
+    @field_validator('tag_ids')
+    def tag_ids_must_be_unique(cls, tag_ids: Optional[List[int]]):
+        if tag_ids is None:
+            return tag_ids
+        return list(dict.fromkeys(tag_ids))
+
+
+class TransactionBatchItem(TransactionUpdate):
+    transaction_id: int
+    transaction_type_id: Optional[int] = None
+    category_id: Optional[int] = None
+    amount: Optional[Money] = None
+    date: Optional[datetime] = None
+    tag_ids: Optional[List[int]] = None
+
+
+class TransactionBatchUpdate(BaseModel):
+    items: List[TransactionBatchItem] = Field(min_length = 1, max_length = 1000)
+
+    @field_validator('items')
+    def transaction_ids_must_be_unique(cls, items: List[TransactionBatchItem]):
+        if len({item.transaction_id for item in items}) != len(items):
+            raise ValueError('Each transaction can appear only once in a batch')
+        return items
+
+
+class TransactionBatchDelete(BaseModel):
+    ids: List[int] = Field(min_length = 1, max_length = 1000)
+
+
+class TransactionBatchDeleteResult(BaseModel):
+    deleted: int
+
 
 class TransactionRead(TransactionBase):
     transaction_id: int
@@ -89,8 +132,42 @@ class TransactionRead(TransactionBase):
         from_attributes = True
 
 
+class TransactionFilters(BaseModel):
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    category_id: Optional[int] = None
+    transaction_type_id: Optional[int] = None
+    tag_id: Optional[int] = None
+    min_amount: Optional[Decimal] = None
+    max_amount: Optional[Decimal] = None
+
+
+class TransactionPage(BaseModel):
+    items: List[TransactionRead]
+    next_cursor: Optional[str] = None
+
+
+class BulkImportResult(BaseModel):
+    imported: int
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class TransactionExportRow(BaseModel):
+    transaction_id: int
+    date: datetime
+    amount: Money
+    transaction_type_id: int
+    category_id: int
+    description: Optional[str] = None
+    tags: List[str] = []
+
+
 class BudgetBase(BaseModel):
-    limit_amount: float
+    limit_amount: Money
     start_date: datetime
     end_date: datetime
     description: Optional[str] = None
@@ -100,7 +177,7 @@ class BudgetCreate(BudgetBase):
     category_id: int
 
     @field_validator('limit_amount')
-    def limit_amount_must_be_positive(cls, limit_amount: float):
+    def limit_amount_must_be_positive(cls, limit_amount: Money):
         if limit_amount <= 0:
             raise ValueError('Limit amount must be positive')
         return limit_amount
@@ -115,13 +192,13 @@ class BudgetCreate(BudgetBase):
 
 class BudgetUpdate(BaseModel):
     category_id: Optional[int]
-    limit_amount: Optional[float]
+    limit_amount: Optional[Money]
     start_date: Optional[datetime]
     end_date: Optional[datetime]
     description: Optional[str] = None
 
     @field_validator('limit_amount')
-    def limit_amount_must_be_positive(cls, limit_amount: Optional[float]):
+    def limit_amount_must_be_positive(cls, limit_amount: Optional[Money]):
         if limit_amount is not None and limit_amount <= 0:
             raise ValueError('Limit amount must be positive')
         return limit_amount
@@ -138,7 +215,7 @@ class BudgetRead(BudgetBase):
     budget_id: int
     user_id: int
     category_id: int
-    total_spent: float
+    total_spent: Money
 
     class Config:
         from_attributes = True
@@ -156,6 +233,30 @@ class NotificationRead(BaseModel):
         from_attributes = True
 
 
+class NotificationPage(BaseModel):
+    items: List[NotificationRead]
+    next_cursor: Optional[str] = None
+
+
+class NotificationMarkRead(BaseModel):
+    ids: Optional[List[int]] = None
+    before: Optional[datetime] = None
+
+    @model_validator(mode = 'after')
+    def ids_or_before_required(self):
+        if self.ids is None and self.before is None:
+            raise ValueError('Either ids or before must be provided')
+        return self
+
+
+class MarkReadResult(BaseModel):
+    updated: int
+
+
+class UnreadCount(BaseModel):
+    unread: int
+
+
 class CategoryBase(BaseModel):
     name: str
 
@@ -187,3 +288,18 @@ class TransactionTagRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class SummaryGroup(str, Enum):
+    category = "category"
+    month = "month"
+    tag = "tag"
+
+
+class SummaryRow(BaseModel):
+    month: Optional[datetime] = None
+    category_id: Optional[int] = None
+    tag_id: Optional[int] = None
+    transaction_type_id: int
+    total: Money
+    count: int
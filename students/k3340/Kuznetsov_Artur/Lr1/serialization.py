@@ -0,0 +1,32 @@
+from typing import Annotated, Any, Iterable, List, Type, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+
+def row_annotation(annotation: Any) -> Any:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        annotation.model_rebuild()
+        fields = {}
+        for name, field in annotation.model_fields.items():
+            field_annotation = row_annotation(field.annotation)
+            if field.metadata:
+                field_annotation = Annotated[(field_annotation, *field.metadata)]
+            fields[name] = field_annotation
+        return TypedDict(f"{annotation.__name__}Row", fields)
+    if get_origin(annotation) is list:
+        return List[row_annotation(get_args(annotation)[0])]
+    return annotation
+
+
+def read_columns(table: Any, model: Type[BaseModel], exclude: Iterable[str] = ()) -> list:
+    return [getattr(table, name) for name in model.model_fields if name not in exclude]
+
+
+class RowSerializer:
+    def __init__(self, model: Any):
+        self.adapter = TypeAdapter(row_annotation(model))
+
+    def response(self, value: Any) -> Response:
+        return Response(self.adapter.dump_json(value), media_type = "application/json")
@@ -1,26 +1,119 @@
 import asyncio
+import statistics
 import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+from engines import get_engine, split_ranges
 
-async def calculate_sum(start, end):
-    return sum(range(start, end + 1))
+EXECUTORS = ["thread", "process", "cooperative", "inline"]
+COOPERATIVE_CHUNK_SIZE = 10 ** 5
 
 
-async def main(N = 10 ** 9, num_parts = 4):
-    start_time = time.time()
+def sum_range(start, end, engine = "pure"):
+    return get_engine(engine)(start, end)
 
-    chunk_size = N // num_parts
-    ranges = []
-    for i in range(num_parts):
-        start = i * chunk_size + 1
-        end = (i + 1) * chunk_size if i < num_parts - 1 else N
-        ranges.append((start, end))
 
-    tasks = [calculate_sum(start, end) for start, end in ranges]
+async def calculate_sum(start, end, engine = "pure"):
+    return sum_range(start, end, engine)
+
+
+async def calculate_sum_cooperatively(start, end, engine = "pure", chunk_size = COOPERATIVE_CHUNK_SIZE):
+    total = 0
+    for chunk_start in range(start, end + 1, chunk_size):
+        total += sum_range(chunk_start, min(chunk_start + chunk_size - 1, end), engine)
+        await asyncio.sleep(0)
+    return total
+
+
+def create_executor(executor, num_parts):
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers = num_parts)
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers = num_parts)
+    return None
+
+
+@contextmanager
+def open_executor(executor, num_parts):
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}, expected one of {', '.join(EXECUTORS)}")
+
+    pool = create_executor(executor, num_parts)
+    try:
+        if pool is not None:
+            list(pool.map(abs, range(num_parts)))
+        yield pool
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+async def run(N, num_parts, engine = "pure", executor = "thread", pool = None):
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}, expected one of {', '.join(EXECUTORS)}")
+    if pool is None and executor in ("thread", "process"):
+        with open_executor(executor, num_parts) as pool:
+            return await run(N, num_parts, engine, executor, pool)
+
+    ranges = split_ranges(N, num_parts)
+    if pool is not None:
+        loop = asyncio.get_running_loop()
+        tasks = [loop.run_in_executor(pool, sum_range, start, end, engine) for start, end in ranges]
+    elif executor == "cooperative":
+        tasks = [calculate_sum_cooperatively(start, end, engine) for start, end in ranges]
+    else:
+        tasks = [calculate_sum(start, end, engine) for start, end in ranges]
     results = await asyncio.gather(*tasks)
 
-    total_sum = sum(results)
-    end_time = time.time()
+    return sum(results)
+
+
+async def heartbeat(interval, lags, stopped):
+    loop = asyncio.get_running_loop()
+    while not stopped.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def measure_loop_lag(N, num_parts, engine = "pure", executor = "thread", interval = 0.01):
+    with open_executor(executor, num_parts) as pool:
+        lags = []
+        stopped = asyncio.Event()
+        monitor = asyncio.create_task(heartbeat(interval, lags, stopped))
+        await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        total = await run(N, num_parts, engine, executor, pool)
+        elapsed = time.perf_counter() - started
+
+        stopped.set()
+        await monitor
+    return {
+        "executor": executor,
+        "total": total,
+        "elapsed_s": elapsed,
+        "ticks": len(lags),
+        "expected_ticks": int(elapsed / interval),
+        "max_lag_ms": max(lags, default = 0.0) * 1000,
+        "median_lag_ms": statistics.median(lags) * 1000 if lags else 0.0,
+    }
+
+
+def print_loop_lag(results):
+    print(f"{'executor':<12}{'time s':>9}{'ticks':>8}{'expected':>10}{'max lag ms':>12}{'median lag ms':>15}")
+    for result in results:
+        print(
+            f"{result['executor']:<12}{result['elapsed_s']:>9.3f}{result['ticks']:>8}{result['expected_ticks']:>10}"
+            f"{result['max_lag_ms']:>12.1f}{result['median_lag_ms']:>15.2f}"
+        )
+
+
+async def main(N = 10 ** 9, num_parts = 4, engine = "pure", executor = "thread"):
+    start_time = time.perf_counter()
+    total_sum = await run(N, num_parts, engine, executor)
+    end_time = time.perf_counter()
 
     print(f"Sum: {total_sum}")
     print(f"Time: {end_time - start_time:.2f} seconds")
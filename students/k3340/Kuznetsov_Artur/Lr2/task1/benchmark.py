@@ -0,0 +1,199 @@
+import asyncio
+import csv
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from multiprocessing.pool import Pool
+
+import threading_sum, async_sum, multiprocessing_sum
+from engines import DEFAULT_ENGINE, closed_form_sum
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+VARIANTS = {
+    "threading": lambda config, pool: threading_sum.run(
+        config["n"], config["parts"], config["engine"], config["thread_mode"]
+    ),
+    "multiprocessing": lambda config, pool: multiprocessing_sum.run_on_pool(
+        pool, config["n"], config["parts"], config["engine"]
+    ),
+    "async": lambda config, pool: asyncio.run(
+        async_sum.run(config["n"], config["parts"], config["engine"], config["executor"], pool)
+    ),
+}
+# resources created once per measurement, outside the timed runs
+VARIANT_POOLS = {
+    "multiprocessing": lambda config: Pool(processes = config["parts"]),
+    "async": lambda config: async_sum.open_executor(config["executor"], config["parts"]),
+}
+CSV_FIELDS = [
+    "variant", "engine", "executor", "thread_mode", "n", "parts", "repeat", "warmup",
+    "min_s", "median_s", "p95_s", "cpu_median_s", "peak_rss_mb",
+]
+
+
+def children_cpu_time():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(config):
+    run = VARIANTS[config["variant"]]
+    open_pool = VARIANT_POOLS.get(config["variant"], lambda config: nullcontext())
+    expected = closed_form_sum(1, config["n"])
+
+    timings = []
+    cpu_times = []
+    with open_pool(config) as pool:
+        for _ in range(config["warmup"]):
+            run(config, pool)
+
+        for _ in range(config["repeat"]):
+            cpu_start = time.process_time() + children_cpu_time()
+            started = time.perf_counter()
+            total = run(config, pool)
+            timings.append(time.perf_counter() - started)
+            cpu_times.append(time.process_time() + children_cpu_time() - cpu_start)
+            if total != expected:
+                raise RuntimeError(f"{config['variant']} returned {total}, expected {expected}")
+        # getrusage only sees the CPU time of workers that have exited
+        cpu_visible = not isinstance(pool, (ProcessPoolExecutor, Pool))
+
+    return {
+        **config,
+        "timings_s": timings,
+        "cpu_times_s": cpu_times if cpu_visible else None,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "p95_s": percentile(timings, 0.95),
+        "cpu_median_s": statistics.median(cpu_times) if cpu_visible else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def measure_in_subprocess(config):
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), json.dumps(config)],
+        cwd = os.path.dirname(os.path.abspath(__file__)),
+        capture_output = True,
+        text = True,
+        check = True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(
+    variants, sizes, parts, engine, repeat, warmup, executor = "thread", thread_mode = "threads", isolate = True
+):
+    results = []
+    for n in sizes:
+        for num_parts in parts:
+            for variant in variants:
+                config = {
+                    "variant": variant,
+                    "engine": (
+                        threading_sum.resolve_mode(thread_mode, engine)[1] if variant == "threading"
+                        else engine or DEFAULT_ENGINE
+                    ),
+                    "executor": executor if variant == "async" else None,
+                    "thread_mode": thread_mode if variant == "threading" else None,
+                    "n": n,
+                    "parts": num_parts,
+                    "repeat": repeat,
+                    "warmup": warmup,
+                }
+                result = measure_in_subprocess(config) if isolate else measure(config)
+                print(f"  {label(config):<22} {config['engine']:<12} n={n:<12} parts={num_parts:<3} median {result['median_s']:.4f}s", flush = True)
+                results.append(result)
+    return results
+
+
+def environment():
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "gil_enabled": threading_sum.gil_enabled(),
+        "timestamp": datetime.now().isoformat(timespec = "seconds"),
+    }
+
+
+def write_json(path, results):
+    with open(path, "w") as file:
+        json.dump({"environment": environment(), "results": results}, file, indent = 2)
+
+
+def write_csv(path, results):
+    with open(path, "w", newline = "") as file:
+        writer = csv.DictWriter(file, fieldnames = CSV_FIELDS, extrasaction = "ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def result_key(result):
+    return (
+        result["variant"], result["engine"], result.get("executor"), result.get("thread_mode"), result["n"],
+        result["parts"]
+    )
+
+
+def load_results(path):
+    with open(path) as file:
+        return {result_key(result): result for result in json.load(file)["results"]}
+
+
+def label(result):
+    option = result.get("executor") or result.get("thread_mode")
+    return f"{result['variant']} ({option})" if option else result["variant"]
+
+
+def print_table(results, baseline = None):
+    header = f"{'variant':<22}{'engine':<12}{'n':>12}{'parts':>6}{'min s':>10}{'median s':>10}{'p95 s':>10}{'cpu s':>10}{'rss MB':>8}"
+    if baseline is not None:
+        header += f"{'vs base':>9}"
+    print(header)
+    for result in results:
+        rss = "-" if result["peak_rss_mb"] is None else f"{result['peak_rss_mb']:.1f}"
+        cpu = "-" if result["cpu_median_s"] is None else f"{result['cpu_median_s']:.4f}"
+        line = (
+            f"{label(result):<22}{result['engine']:<12}{result['n']:>12}{result['parts']:>6}"
+            f"{result['min_s']:>10.4f}{result['median_s']:>10.4f}{result['p95_s']:>10.4f}"
+            f"{cpu:>10}{rss:>8}"
+        )
+        if baseline is not None:
+            previous = baseline.get(result_key(result))
+            line += f"{result['median_s'] / previous['median_s']:>8.2f}x" if previous else f"{'-':>9}"
+        print(line)
+
+
+if __name__ == "__main__":
+    print(json.dumps(measure(json.loads(sys.argv[1]))))
@@ -0,0 +1,79 @@
+import random
+
+NUMPY_CHUNK_SIZE = 10 ** 7
+DEFAULT_ENGINE = "pure"
+
+
+def pure_sum(start, end):
+    return sum(range(start, end + 1))
+
+
+def closed_form_sum(start, end):
+    if end < start:
+        return 0
+    return (start + end) * (end - start + 1) // 2
+
+
+def numpy_sum(start, end, chunk_size = NUMPY_CHUNK_SIZE):
+    import numpy as np
+
+    total = 0
+    for chunk_start in range(start, end + 1, chunk_size):
+        count = min(chunk_size, end - chunk_start + 1)
+        offsets = np.arange(count, dtype = np.int64)
+        total += chunk_start * count + int(offsets.sum())
+    return total
+
+
+def split_ranges(N, num_parts):
+    chunk_size = N // num_parts
+    ranges = []
+    for i in range(num_parts):
+        start = i * chunk_size + 1
+        end = (i + 1) * chunk_size if i < num_parts - 1 else N
+        ranges.append((start, end))
+    return ranges
+
+
+ENGINES = {
+    "pure": pure_sum,
+    "closed_form": closed_form_sum,
+    "numpy": numpy_sum,
+}
+
+
+def get_engine(name):
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine {name!r}, expected one of {', '.join(ENGINES)}")
+    return ENGINES[name]
+
+
+def check_cases(count = 200, seed = 0):
+    rng = random.Random(seed)
+    cases = [
+        (1, 1),
+        (5, 4),
+        (-10, 10),
+        (-(10 ** 6), -1),
+        (1, NUMPY_CHUNK_SIZE + 1),
+        (2 ** 62, 2 ** 62 + 1000),
+        (2 ** 63 - 10, 2 ** 63 + 10),
+        (-(2 ** 64) - 5, -(2 ** 64) + 5),
+        (10 ** 30, 10 ** 30 + 12345),
+    ]
+    for _ in range(count):
+        start = rng.randint(-(10 ** 12), 10 ** 12)
+        cases.append((start, start + rng.randint(-1, 10 ** 4)))
+    return cases
+
+
+def check_engines(names = None, cases = None):
+    failures = []
+    for name in names or ENGINES:
+        engine = get_engine(name)
+        for start, end in cases or check_cases():
+            expected = closed_form_sum(start, end)
+            actual = engine(start, end)
+            if actual != expected:
+                failures.append((name, start, end, expected, actual))
+    return failures
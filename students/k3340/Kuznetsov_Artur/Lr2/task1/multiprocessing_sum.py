@@ -1,28 +1,85 @@
 import multiprocessing
+import os
+import statistics
 import time
 
+from engines import get_engine, split_ranges
 
-def calculate_sum(start, end):
-    return sum(range(start, end + 1))
+START_METHODS = multiprocessing.get_all_start_methods()
 
 
-def main(N = 10 ** 9, num_parts = 4):
-    start_time = time.time()
-    pool = multiprocessing.Pool(processes = num_parts)
+def calculate_sum(start, end, engine = "pure"):
+    return get_engine(engine)(start, end)
+
 
-    chunk_size = N // num_parts
-    ranges = []
-    for i in range(num_parts):
-        start = i * chunk_size + 1
-        end = (i + 1) * chunk_size if i < num_parts - 1 else N
-        ranges.append((start, end))
+def run(N, num_parts, engine = "pure"):
+    pool = multiprocessing.Pool(processes = num_parts)
 
-    results = pool.starmap(calculate_sum, ranges)
+    results = pool.starmap(calculate_sum, [(start, end, engine) for start, end in split_ranges(N, num_parts)])
     pool.close()
     pool.join()
 
-    total_sum = sum(results)
-    end_time = time.time()
+    return sum(results)
+
+
+def run_on_pool(pool, N, num_parts, engine = "pure"):
+    return sum(pool.starmap(
+        calculate_sum, [(start, end, engine) for start, end in split_ranges(N, num_parts)], chunksize = 1
+    ))
+
+
+def sweep(N, engine = "pure", max_workers = None, start_method = None, repeat = 3):
+    max_workers = max_workers or os.cpu_count() or 1
+    context = multiprocessing.get_context(start_method)
+
+    started = time.perf_counter()
+    pool = context.Pool(processes = max_workers)
+    pool.map(abs, range(max_workers), chunksize = 1)
+    startup = time.perf_counter() - started
+
+    results = []
+    try:
+        for workers in range(1, max_workers + 1):
+            run_on_pool(pool, N, workers, engine)
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run_on_pool(pool, N, workers, engine)
+                timings.append(time.perf_counter() - started)
+            results.append({
+                "workers": workers,
+                "start_method": context.get_start_method(),
+                "engine": engine,
+                "n": N,
+                "pool_startup_s": startup,
+                "median_s": statistics.median(timings),
+                "min_s": min(timings),
+            })
+    finally:
+        pool.close()
+        pool.join()
+
+    baseline = results[0]["median_s"]
+    for result in results:
+        result["speedup"] = baseline / result["median_s"]
+        result["efficiency"] = result["speedup"] / result["workers"]
+    return results
+
+
+def print_sweep(results):
+    print(f"Pool start-up ({results[0]['start_method']}, {len(results)} workers): {results[0]['pool_startup_s']:.3f} seconds")
+    print(f"{'workers':>8}{'median s':>10}{'min s':>10}{'speedup':>9}{'efficiency':>12}")
+    for result in results:
+        print(
+            f"{result['workers']:>8}{result['median_s']:>10.4f}{result['min_s']:>10.4f}"
+            f"{result['speedup']:>9.2f}{result['efficiency']:>11.0%}"
+        )
+
+
+def main(N = 10 ** 9, num_parts = 4, engine = "pure"):
+    start_time = time.perf_counter()
+    total_sum = run(N, num_parts, engine)
+    end_time = time.perf_counter()
 
     print(f"Sum: {total_sum}")
     print(f"Time: {end_time - start_time:.2f} seconds")
@@ -1,16 +1,72 @@
+import argparse
 import asyncio
-import threading_sum, async_sum, multiprocessing_sum
+import sys
+from async_sum import EXECUTORS, measure_loop_lag, print_loop_lag
+from benchmark import VARIANTS, load_results, print_table, run_benchmarks, write_csv, write_json
+from engines import DEFAULT_ENGINE, ENGINES, check_engines
+from multiprocessing_sum import START_METHODS, print_sweep, sweep
+from threading_sum import THREAD_MODES, gil_enabled
 
 
 def main():
-    print("\nThreading:")
-    threading_sum.main()
+    parser = argparse.ArgumentParser(description = "Benchmark summing 1..N with threads, processes and asyncio")
+    parser.add_argument("--variants", nargs = "+", choices = list(VARIANTS), default = list(VARIANTS))
+    parser.add_argument(
+        "--engine", choices = list(ENGINES),
+        help = f"defaults to {DEFAULT_ENGINE}, or to numpy for --thread-mode auto while the GIL is enabled"
+    )
+    parser.add_argument("--n", type = int, nargs = "+", default = [10 ** 9])
+    parser.add_argument("--parts", type = int, nargs = "+", default = [4])
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--warmup", type = int, default = 1, help = "runs discarded before measuring")
+    parser.add_argument("--json", help = "write the raw results to this file")
+    parser.add_argument("--csv", help = "write the summary rows to this file")
+    parser.add_argument("--compare", help = "a previous --json file to compare medians against")
+    parser.add_argument("--executor", choices = EXECUTORS, default = "thread", help = "how the async variant runs its chunks")
+    parser.add_argument("--thread-mode", choices = THREAD_MODES, default = "threads", help = "how the threading variant splits work")
+    parser.add_argument("--loop-lag", action = "store_true", help = "measure event-loop responsiveness for every async executor")
+    parser.add_argument("--in-process", action = "store_true", help = "skip the per-configuration subprocess")
+    parser.add_argument("--sweep", action = "store_true", help = "sweep multiprocessing workers over one persistent pool")
+    parser.add_argument("--max-workers", type = int, help = "upper bound of the sweep, defaults to os.cpu_count()")
+    parser.add_argument("--start-method", choices = START_METHODS, help = "multiprocessing start method for the sweep")
+    parser.add_argument("--check", action = "store_true", help = "verify every engine against the closed form and exit")
+    args = parser.parse_args()
 
-    print("\nMultiprocessing:")
-    multiprocessing_sum.main()
+    if args.check:
+        failures = check_engines()
+        for name, start, end, expected, actual in failures:
+            print(f"{name}: sum({start}..{end}) = {actual}, expected {expected}")
+        print("All engines agree with the closed form" if not failures else f"{len(failures)} mismatches")
+        sys.exit(1 if failures else 0)
 
-    print("\nAsync:")
-    asyncio.run(async_sum.main())
+    engine = args.engine or DEFAULT_ENGINE
+    if args.sweep:
+        results = sweep(args.n[0], engine, args.max_workers, args.start_method, args.repeat)
+        if args.json:
+            write_json(args.json, results)
+        print_sweep(results)
+        return
+
+    if args.loop_lag:
+        results = [
+            asyncio.run(measure_loop_lag(args.n[0], args.parts[0], engine, executor)) for executor in EXECUTORS
+        ]
+        if args.json:
+            write_json(args.json, results)
+        print_loop_lag(results)
+        return
+
+    print(f"{sys.implementation.name} {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}")
+    results = run_benchmarks(
+        args.variants, args.n, args.parts, args.engine, args.repeat, args.warmup, args.executor, args.thread_mode,
+        isolate = not args.in_process
+    )
+    if args.json:
+        write_json(args.json, results)
+    if args.csv:
+        write_csv(args.csv, results)
+    print()
+    print_table(results, load_results(args.compare) if args.compare else None)
 
 
 if __name__ == "__main__":
@@ -1,34 +1,94 @@
+import sys
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+from engines import DEFAULT_ENGINE, get_engine, split_ranges
 
-def calculate_sum(start, end, results, index):
-    total = sum(range(start, end + 1))
+THREAD_MODES = ["threads", "steal", "numpy", "auto"]
+SUBCHUNK_SIZE = 10 ** 6
+
+
+def gil_enabled():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def calculate_sum(start, end, results, index, engine = "pure"):
+    total = get_engine(engine)(start, end)
     results[index] = total
 
 
-def main(N = 10 ** 9, num_parts = 4):
-    start_time = time.time()
+def subchunks(start, end, subchunk_size = SUBCHUNK_SIZE):
+    return deque(
+        (chunk_start, min(chunk_start + subchunk_size - 1, end)) for chunk_start in range(start, end + 1, subchunk_size)
+    )
+
+
+def steal(queues, index):
+    for offset in range(1, len(queues)):
+        try:
+            return queues[(index + offset) % len(queues)].popleft()
+        except IndexError:
+            continue
+    return None
+
+
+def sum_with_stealing(queues, index, engine = "pure"):
+    total = 0
+    own = queues[index]
+    while True:
+        try:
+            item = own.pop()
+        except IndexError:
+            item = steal(queues, index)
+            if item is None:
+                return total
+        total += get_engine(engine)(*item)
+
+
+def resolve_mode(mode, engine = None):
+    if mode == "auto":
+        return "steal", engine or ("numpy" if gil_enabled() else DEFAULT_ENGINE)
+    if mode == "numpy":
+        return "steal", "numpy"
+    return mode, engine or DEFAULT_ENGINE
+
+
+def run_stealing(N, num_parts, engine = "pure", subchunk_size = SUBCHUNK_SIZE):
+    queues = [subchunks(start, end, subchunk_size) for start, end in split_ranges(N, num_parts)]
+    with ThreadPoolExecutor(max_workers = num_parts) as pool:
+        futures = [pool.submit(sum_with_stealing, queues, index, engine) for index in range(num_parts)]
+        return sum(future.result() for future in futures)
+
+
+def run(N, num_parts, engine = None, mode = "threads"):
+    if mode not in THREAD_MODES:
+        raise ValueError(f"Unknown thread mode {mode!r}, expected one of {', '.join(THREAD_MODES)}")
+    mode, engine = resolve_mode(mode, engine)
+    if mode == "steal":
+        return run_stealing(N, num_parts, engine)
+
     threads = []
     results = [0] * num_parts
-
-    chunk_size = N // num_parts
-    ranges = []
-    for i in range(num_parts):
-        start = i * chunk_size + 1
-        end = (i + 1) * chunk_size if i < num_parts - 1 else N
-        ranges.append((start, end))
+    ranges = split_ranges(N, num_parts)
 
     for i, (start, end) in enumerate(ranges):
-        thread = threading.Thread(target = calculate_sum, args = (start, end, results, i))
+        thread = threading.Thread(target = calculate_sum, args = (start, end, results, i, engine))
         threads.append(thread)
         thread.start()
 
     for thread in threads:
         thread.join()
 
-    total_sum = sum(results)
-    end_time = time.time()
+    return sum(results)
+
+
+def main(N = 10 ** 9, num_parts = 4, engine = None, mode = "threads"):
+    start_time = time.perf_counter()
+    total_sum = run(N, num_parts, engine, mode)
+    end_time = time.perf_counter()
 
     print(f"Sum: {total_sum}")
     print(f"Time: {end_time - start_time:.2f} seconds")
@@ -1,10 +1,14 @@
 import os
+import sys
 from dotenv import load_dotenv
 from sqlmodel import SQLModel, Session, create_engine
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from db_settings import engine_options, instrument_pool
+
 load_dotenv()
 db_url = os.getenv('DB_ADMIN')
-engine = create_engine(db_url, echo=True)
+engine = instrument_pool(create_engine(db_url, **engine_options(db_url)))
 
 
 def init_db():
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(db_url: str, is_async: bool = False) -> dict:
+    options = {
+        "echo": env_bool("DB_ECHO", False),
+        "pool_pre_ping": env_bool("DB_POOL_PRE_PING", True),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    if db_url.startswith("sqlite"):
+        return options
+
+    options.update(
+        pool_size = int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    )
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    if statement_timeout and db_url.startswith("postgresql"):
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+    return options
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pools = []
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.max_in_use = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def register(self, pool):
+        self.pools.append(pool)
+        event.listen(pool, "connect", self.on_connect)
+        event.listen(pool, "checkout", self.on_checkout)
+        event.listen(pool, "checkin", self.on_checkin)
+
+    def queue_pools(self) -> list:
+        return [pool for pool in self.pools if isinstance(pool, QueuePool)]
+
+    def on_connect(self, *args):
+        with self.lock:
+            self.connects += 1
+
+    def on_checkout(self, *args):
+        with self.lock:
+            self.checkouts += 1
+            in_use = sum(pool.checkedout() for pool in self.queue_pools()) or self.checkouts - self.checkins
+            self.max_in_use = max(self.max_in_use, in_use)
+
+    def on_checkin(self, *args):
+        with self.lock:
+            self.checkins += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self.lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    @contextmanager
+    def timed_acquire(self):
+        started = time.perf_counter()
+        try:
+            yield
+        except PoolTimeoutError:
+            self.record_wait(time.perf_counter() - started, timed_out = True)
+            raise
+        self.record_wait(time.perf_counter() - started)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "in_use": self.checkouts - self.checkins,
+                "max_in_use": self.max_in_use,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": self.wait_total / self.waits * 1000 if self.waits else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+                "pools": [
+                    {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": max(pool.overflow(), 0)}
+                    for pool in self.queue_pools()
+                ],
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+def instrument_pool(engine, metrics: PoolMetrics = pool_metrics):
+    metrics.register(engine.pool)
+    return engine